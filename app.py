@@ -6,14 +6,17 @@ Handles authentication, user management, and bot control
 
 import os
 import secrets
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, make_response
 from flask_session import Session
 from requests_oauthlib import OAuth1Session
 from dotenv import load_dotenv
-from user_manager import UserManager
+from user_manager import get_user_manager
 from credentials import CredentialManager
 from bot_manager import BotManager
-import json
+from storage import get_storage
+from content_registry import default_tweet_queue, thaw
+from read_cache import READ_CACHE
+from tweet_queue_store import create_tweet_queue, open_tweet_queue
 from pathlib import Path
 from datetime import datetime
 
@@ -30,8 +33,10 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 Session(app)
 
 # Initialize managers
-user_manager = UserManager()
+user_manager = get_user_manager()
 bot_manager = BotManager()
+# Page loads are served from the read cache as frozen objects
+storage = get_storage().cached()
 
 # Twitter OAuth configuration
 TWITTER_API_KEY = os.getenv('TWITTER_OAUTH_API_KEY') or os.getenv('API_KEY')
@@ -56,6 +61,38 @@ def login_required(f):
     return decorated_function
 
 
+# Changes on restart, so pages rendered by older templates are revalidated
+RENDER_TOKEN = secrets.token_hex(8)
+
+
+@app.before_request
+def track_reads():
+    """Record the files each request reads, for its ETag"""
+    READ_CACHE.begin()
+
+
+def render_cached(template, *validators, **context):
+    """
+    Render template with an ETag covering the files read for it, the
+    user's stored bot state and validators, answering 304 if the
+    browser's copy is still current. Without a state version from the
+    backend the page is always rendered and gets no ETag.
+    """
+    user_id = session.get('user_id')
+    state_version = storage.state_version(user_id) if user_id else ()
+    etag = READ_CACHE.end(RENDER_TOKEN, user_id, state_version, *validators)
+    # Pending flash messages are part of the page but not of the ETag
+    if (state_version is not None and request.method == 'GET'
+            and not session.get('_flashes') and etag in request.if_none_match):
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template(template, **context))
+    if state_version is not None:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @app.route('/')
 def index():
     """Landing page - redirect to login or dashboard"""
@@ -196,13 +233,9 @@ def dashboard():
     bot_status = bot_manager.get_bot_status(user_id)
     
     # Load bot data for stats
-    bot_data_file = Path('users') / user_id / 'bot_data.json'
-    bot_data = {}
-    if bot_data_file.exists():
-        with open(bot_data_file, 'r') as f:
-            bot_data = json.load(f)
+    bot_data = storage.load_bot_data(user_id) or {}
     
-    return render_template('dashboard.html', 
+    return render_cached('dashboard.html', repr(user), repr(bot_status),
                          user=user, 
                          bot_status=bot_status,
                          bot_data=bot_data)
@@ -267,9 +300,14 @@ def settings():
             'tweets_per_day': int(request.form.get('tweets_per_day', 6)),
             'posting_times': request.form.get('posting_times', '').split(','),
             'engagement_interval': int(request.form.get('engagement_interval', 15)),
-            'max_replies_per_hour': int(request.form.get('max_replies_per_hour', 5))
+            'max_replies_per_hour': int(request.form.get('max_replies_per_hour', 5)),
+            'relevance_classifier': request.form.get('relevance_classifier', 'rules'),
+            'relevance_threshold': float(request.form.get('relevance_threshold', 0.5))
         }
         
+        if config['relevance_classifier'] not in ('rules', 'model'):
+            config['relevance_classifier'] = 'rules'
+        
         # Clean posting times
         config['posting_times'] = [t.strip() for t in config['posting_times'] if t.strip()]
         
@@ -288,13 +326,9 @@ def stats():
     user_id = session['user_id']
     
     # Load bot data
-    bot_data_file = Path('users') / user_id / 'bot_data.json'
-    bot_data = {}
-    if bot_data_file.exists():
-        with open(bot_data_file, 'r') as f:
-            bot_data = json.load(f)
+    bot_data = storage.load_bot_data(user_id) or {}
     
-    return render_template('stats.html', bot_data=bot_data)
+    return render_cached('stats.html', bot_data=bot_data)
 
 
 @app.route('/api/bot/start', methods=['POST'])
@@ -354,50 +388,51 @@ def keywords():
     keywords = config.get('keywords', {})
     
     # Load reply templates
-    reply_templates_file = Path('users') / user_id / 'reply_templates.json'
-    if reply_templates_file.exists():
-        with open(reply_templates_file, 'r') as f:
-            reply_templates = json.load(f)
-    else:
-        # Initialize with default templates from bot_core
-        from bot_core import REPLY_TEMPLATES
-        reply_templates = REPLY_TEMPLATES.copy()
-        with open(reply_templates_file, 'w') as f:
-            json.dump(reply_templates, f, indent=2)
+    from bot_core import default_reply_templates
+    reply_templates = storage.load_document(user_id, 'reply_templates')
+    if reply_templates is None:
+        # Shared default templates until the user customizes them
+        reply_templates = default_reply_templates()
     
     if request.method == 'POST':
+        # Each edit is applied to the stored value (re-applied if another
+        # worker saved first); the user's own templates start from the defaults
         action = request.form.get('action')
         
         if action == 'add':
             category = request.form.get('category')
             keyword = request.form.get('keyword', '').strip()
             
-            if category and keyword:
-                if category not in keywords:
-                    keywords[category] = []
-                if keyword not in keywords[category]:
-                    keywords[category].append(keyword)
-                    user_manager.update_user_config(user_id, {'keywords': keywords})
-                    flash('Keyword added successfully!', 'success')
+            if category and keyword and keyword not in keywords.get(category, ()):
+                def add_keyword(config):
+                    category_keywords = config.setdefault('keywords', {}).setdefault(category, [])
+                    if keyword not in category_keywords:
+                        category_keywords.append(keyword)
+                
+                user_manager.modify_user_config(user_id, add_keyword)
+                flash('Keyword added successfully!', 'success')
         
         elif action == 'remove':
             category = request.form.get('category')
             keyword = request.form.get('keyword')
             
             if category in keywords and keyword in keywords[category]:
-                keywords[category].remove(keyword)
-                user_manager.update_user_config(user_id, {'keywords': keywords})
+                def remove_keyword(config):
+                    category_keywords = config.get('keywords', {}).get(category, [])
+                    if keyword in category_keywords:
+                        category_keywords.remove(keyword)
+                
+                user_manager.modify_user_config(user_id, remove_keyword)
                 flash('Keyword removed successfully!', 'success')
         
         elif action == 'add_category':
             new_category = request.form.get('new_category', '').strip()
             if new_category and new_category not in keywords:
-                keywords[new_category] = []
-                if new_category not in reply_templates:
-                    reply_templates[new_category] = []
-                user_manager.update_user_config(user_id, {'keywords': keywords})
-                with open(reply_templates_file, 'w') as f:
-                    json.dump(reply_templates, f, indent=2)
+                user_manager.modify_user_config(
+                    user_id, lambda config: config.setdefault('keywords', {}).setdefault(new_category, []))
+                storage.update_document(user_id, 'reply_templates',
+                                        lambda templates: templates.setdefault(new_category, []),
+                                        default=default_reply_templates())
                 flash('Category added successfully!', 'success')
         
         elif action == 'add_reply':
@@ -405,11 +440,9 @@ def keywords():
             reply_text = request.form.get('reply_text', '').strip()
             
             if category and reply_text:
-                if category not in reply_templates:
-                    reply_templates[category] = []
-                reply_templates[category].append(reply_text)
-                with open(reply_templates_file, 'w') as f:
-                    json.dump(reply_templates, f, indent=2)
+                storage.update_document(user_id, 'reply_templates',
+                                        lambda templates: templates.setdefault(category, []).append(reply_text),
+                                        default=default_reply_templates())
                 flash('Reply template added!', 'success')
         
         elif action == 'remove_reply':
@@ -417,14 +450,18 @@ def keywords():
             reply_index = int(request.form.get('reply_index'))
             
             if category in reply_templates and 0 <= reply_index < len(reply_templates[category]):
-                reply_templates[category].pop(reply_index)
-                with open(reply_templates_file, 'w') as f:
-                    json.dump(reply_templates, f, indent=2)
+                def remove_reply(templates):
+                    replies = templates.get(category, [])
+                    if 0 <= reply_index < len(replies):
+                        replies.pop(reply_index)
+                
+                storage.update_document(user_id, 'reply_templates', remove_reply,
+                                        default=default_reply_templates())
                 flash('Reply template removed!', 'success')
         
         return redirect(url_for('keywords'))
     
-    return render_template('keywords.html', keywords=keywords, reply_templates=reply_templates, user=user)
+    return render_cached('keywords.html', repr(user), keywords=keywords, reply_templates=reply_templates, user=user)
 
 
 @app.route('/tweets', methods=['GET', 'POST'])
@@ -435,36 +472,23 @@ def tweets():
     user = user_manager.get_user(user_id)
     
     # Load tweet queue
-    queue_file = Path('users') / user_id / 'tweet_queue.json'
-    if queue_file.exists():
-        with open(queue_file, 'r') as f:
-            tweet_queue = json.load(f)
-    else:
-        # Fallback to default queue
-        default_queue = Path('tweet_queue.json')
-        if default_queue.exists():
-            with open(default_queue, 'r') as f:
-                tweet_queue = json.load(f)
-        else:
-            tweet_queue = []
+    own_queue = open_tweet_queue(user_id)
+    # Fallback to the shared default queue
+    tweet_queue = own_queue if own_queue is not None else default_tweet_queue()
     
     # Load scheduled tweets
-    scheduled_file = Path('users') / user_id / 'scheduled_tweets.json'
-    if scheduled_file.exists():
-        with open(scheduled_file, 'r') as f:
-            scheduled_tweets = json.load(f)
-    else:
-        scheduled_tweets = []
+    scheduled_tweets = storage.load_scheduled_tweets(user_id)
     
     if request.method == 'POST':
         action = request.form.get('action')
+        if action in ('add', 'remove') and own_queue is None:
+            # Copy-on-write: edits go to the user's own queue
+            tweet_queue = create_tweet_queue(user_id, tweet_queue)
         
         if action == 'add':
             tweet_text = request.form.get('tweet_text', '').strip()
             if tweet_text and len(tweet_text) <= 280:
                 tweet_queue.append(tweet_text)
-                with open(queue_file, 'w') as f:
-                    json.dump(tweet_queue, f, indent=2)
                 flash('Tweet added to queue!', 'success')
             else:
                 flash('Tweet must be between 1 and 280 characters', 'error')
@@ -481,11 +505,12 @@ def tweets():
                     'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'status': 'pending'
                 }
-                scheduled_tweets.append(scheduled_tweet)
-                # Sort by datetime
-                scheduled_tweets.sort(key=lambda x: x['datetime'])
-                with open(scheduled_file, 'w') as f:
-                    json.dump(scheduled_tweets, f, indent=2)
+                def add_scheduled(tweets):
+                    tweets.append(scheduled_tweet)
+                    # Sort by datetime
+                    tweets.sort(key=lambda x: x['datetime'])
+                
+                storage.update_scheduled_tweets(user_id, add_scheduled)
                 flash('Tweet scheduled successfully!', 'success')
             else:
                 flash('Please fill in all fields correctly', 'error')
@@ -495,8 +520,6 @@ def tweets():
                 index = int(request.form.get('index'))
                 if 0 <= index < len(tweet_queue):
                     tweet_queue.pop(index)
-                    with open(queue_file, 'w') as f:
-                        json.dump(tweet_queue, f, indent=2)
                     flash('Tweet removed from queue!', 'success')
             except (ValueError, IndexError):
                 flash('Invalid tweet index', 'error')
@@ -505,16 +528,22 @@ def tweets():
             try:
                 index = int(request.form.get('index'))
                 if 0 <= index < len(scheduled_tweets):
-                    scheduled_tweets.pop(index)
-                    with open(scheduled_file, 'w') as f:
-                        json.dump(scheduled_tweets, f, indent=2)
+                    # Match by content: the list may have changed since the page was rendered
+                    removed = thaw(scheduled_tweets[index])
+                    
+                    def remove_scheduled(tweets):
+                        if removed in tweets:
+                            tweets.remove(removed)
+                    
+                    storage.update_scheduled_tweets(user_id, remove_scheduled)
                     flash('Scheduled tweet removed!', 'success')
             except (ValueError, IndexError):
                 flash('Invalid scheduled tweet index', 'error')
         
         return redirect(url_for('tweets'))
     
-    return render_template('tweets.html', tweet_queue=tweet_queue, scheduled_tweets=scheduled_tweets, user=user)
+    return render_cached('tweets.html', repr(user), own_queue.version if own_queue is not None else None,
+                         tweet_queue=tweet_queue, scheduled_tweets=scheduled_tweets, user=user)
 
 
 if __name__ == '__main__':
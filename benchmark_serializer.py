@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Serializer Benchmark - Load/save times for each state codec
+Builds realistic large bot_data.json and users.json payloads and times
+every available codec against the original json.dump(..., indent=2)
+
+Usage:
+    python3 benchmark_serializer.py [users] [repeats]
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from serializer import CODECS, get_codec
+from tweet_generator import generate_tweet
+
+
+def build_bot_data() -> dict:
+    """Bot data for a long-running account, including pre-rollup history"""
+    today = date.today()
+    daily = {}
+    for offset in range(365):
+        day = (today - timedelta(days=offset)).strftime('%Y-%m-%d')
+        daily[day] = {'total_tweets_posted': random.randint(4, 8), 'total_replies_sent': random.randint(20, 120)}
+        daily[day].update({f'replies_hour_{hour}': random.randint(0, 5) for hour in range(24)})
+    return {
+        'current_tweet_index': 123,
+        'total_tweets_posted': 2400,
+        'total_replies_sent': 31000,
+        'last_reset': today.strftime('%Y-%m-%d'),
+        'replied_tweets': [str(random.getrandbits(62)) for _ in range(1000)],
+        'posted_tweets': [generate_tweet() for _ in range(200)],
+        'daily_stats': daily,
+        'reply_rotation': {
+            f'{n}:{random.getrandbits(32):08x}': {'order': random.sample(range(12), 12), 'cursor': 3}
+            for n in range(200)
+        }
+    }
+
+
+def build_users(count: int) -> dict:
+    """users.json with the full default bot config per user"""
+    keywords = {
+        category: [f'{category} keyword {n}' for n in range(10)]
+        for category in ('betting', 'investment', 'land', 'co_ownership')
+    }
+    return {
+        f'twitter_{n}': {
+            'user_id': f'twitter_{n}',
+            'username': f'@user{n}',
+            'email': f'user{n}@example.com',
+            'twitter_id': str(n),
+            'created_at': '2025-01-01 12:00:00',
+            'twitter_connected': True,
+            'bot_active': n % 3 == 0,
+            'bot_config': {
+                'tweets_per_day': 6,
+                'posting_times': ['16:00', '20:00', '00:00', '04:00', '08:00', '12:00'],
+                'engagement_interval': 15,
+                'max_replies_per_hour': 5,
+                'keywords': keywords
+            }
+        }
+        for n in range(count)
+    }
+
+
+def _time(func, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark(name: str, payload, repeats: int):
+    print(f"\n📦 {name}")
+    print(f"   {'codec':<20}{'size':>12}{'save ms':>12}{'load ms':>12}")
+
+    baseline = json.dumps(payload, indent=2).encode()
+    save_ms = _time(lambda: json.dumps(payload, indent=2), repeats)
+    load_ms = _time(lambda: json.loads(baseline), repeats)
+    print(f"   {'json indent=2':<20}{len(baseline):>12,}{save_ms:>12.2f}{load_ms:>12.2f}")
+
+    for codec_name in CODECS:
+        try:
+            codec = get_codec(codec_name)
+        except ImportError as e:
+            print(f"   {codec_name:<20}skipped ({e})")
+            continue
+        data = codec.dumps(payload)
+        assert codec.loads(data) == payload
+        save_ms = _time(lambda: codec.dumps(payload), repeats)
+        load_ms = _time(lambda: codec.loads(data), repeats)
+        print(f"   {codec_name:<20}{len(data):>12,}{save_ms:>12.2f}{load_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    random.seed(42)
+    benchmark("bot_data.json (1 year of history)", build_bot_data(), repeats)
+    benchmark(f"users.json ({user_count:,} users)", build_users(user_count), repeats)
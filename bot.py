@@ -7,7 +7,6 @@ Handles: Tweet scheduling, keyword monitoring, auto-replies, analytics
 import tweepy
 import schedule
 import time
-import json
 import random
 from datetime import datetime
 from pathlib import Path
@@ -16,7 +15,16 @@ from dotenv import load_dotenv
 import requests
 from bs4 import BeautifulSoup
 import re
-from tweet_generator import generate_tweet
+from template_walk import TemplateWalk
+from relevance import RELEVANCE_ENGINE
+from text_normalizer import PhraseMatcher, TweetCandidate, normalize_text
+from reply_rotation import ReplyRotation
+from duplicate_index import DuplicateIndex
+from replied_index import RepliedIndex
+from write_behind import WriteBehindStore
+from serializer import read_file
+from event_log import EventLog
+from stats_series import StatsSeries
 from difflib import SequenceMatcher
 
 # Load environment variables
@@ -466,6 +474,10 @@ RIPPLE_TRIGGERS = {
     ]
 }
 
+# Compiled word-boundary matchers for the trigger lists above
+ENGAGEMENT_MATCHER = PhraseMatcher(ENGAGEMENT_TRIGGERS)
+RIPPLE_MATCHER = PhraseMatcher(RIPPLE_TRIGGERS)
+
 # Ripple Effect general replies
 RIPPLE_EFFECT_REPLIES = [
     "Ripple Effect theory: society trains its leaders long before elections. Change what we reward, and leadership quality changes over time.",
@@ -477,56 +489,82 @@ RIPPLE_EFFECT_REPLIES = [
 COMMUNITY_LINK = "https://x.com/i/communities/1951416110240149783"
 
 
-class BotData:
-    """Manages persistent bot data"""
+class BotData(WriteBehindStore):
+    """Manages persistent bot data (saves are coalesced, see write_behind)"""
     
     def __init__(self, filepath='bot_data.json'):
         self.filepath = filepath
         self.data = self.load()
+        
+        # Replied tweet IDs live in a compact binary index
+        # (seeded once from the old replied_tweets list)
+        self.replied = RepliedIndex(Path(filepath).with_name('replied_tweets.bin'))
+        replied_tweets = self.data.pop('replied_tweets', [])
+        if not len(self.replied):
+            for tweet_id in replied_tweets:
+                self.replied.add(tweet_id)
+        self.data['replied_tweets_count'] = len(self.replied)
+        
+        # Hourly/daily/monthly stat buckets with bounded retention
+        self.stats = StatsSeries(self.data)
+        self.stats.compact()
+        
+        # Stat changes are appended to an event log; replay any the snapshot misses
+        self.events = EventLog(Path(filepath).with_name('bot_events.jsonl'))
+        replayed = 0
+        for event in self.events.replay(self.data.get('event_seq', 0)):
+            if event.get('type') == 'stat':
+                self._apply_stat(event['name'], event['day'], event.get('hour'))
+                replayed += 1
+        
+        self._init_write_behind()
+        if replayed:
+            self.save()
     
     def load(self):
         """Load bot data from file"""
-        if Path(self.filepath).exists():
-            with open(self.filepath, 'r') as f:
-                return json.load(f)
+        data = read_file(self.filepath)
+        if data is not None:
+            return data
         return {
             'current_tweet_index': 0,
-            'replied_tweets': [],
             'daily_stats': {},
             'total_tweets_posted': 0,
             'total_replies_sent': 0,
             'last_reset': datetime.now().strftime('%Y-%m-%d')
         }
     
-    def save(self):
-        """Save bot data to file"""
-        with open(self.filepath, 'w') as f:
-            json.dump(self.data, f, indent=2)
-    
     def add_replied_tweet(self, tweet_id):
-        """Track replied tweets (keep last 1000)"""
-        self.data['replied_tweets'].append(str(tweet_id))
-        if len(self.data['replied_tweets']) > 1000:
-            self.data['replied_tweets'] = self.data['replied_tweets'][-1000:]
-        self.save()
+        """Track replied tweets (the index writes its own slot to disk)"""
+        self.replied.add(tweet_id)
+        self.data['replied_tweets_count'] = len(self.replied)
     
     def has_replied(self, tweet_id):
         """Check if we've already replied to this tweet"""
-        return str(tweet_id) in self.data['replied_tweets']
+        return tweet_id in self.replied
     
-    def increment_stat(self, stat_name):
-        """Increment a statistic counter"""
+    def _apply_stat(self, stat_name, day, hour=None):
         self.data[stat_name] = self.data.get(stat_name, 0) + 1
         
-        # Daily stats
-        today = datetime.now().strftime('%Y-%m-%d')
-        if today not in self.data['daily_stats']:
-            self.data['daily_stats'][today] = {}
-        self.data['daily_stats'][today][stat_name] = \
-            self.data['daily_stats'][today].get(stat_name, 0) + 1
-        
+        # Hourly, daily and monthly stats
+        self.stats.increment(stat_name, day, hour)
+    
+    def increment_stat(self, stat_name):
+        """Increment a statistic counter (logged now, snapshotted on flush)"""
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        with self._flush_lock:
+            self._apply_stat(stat_name, today, now.hour)
+            self.events.append({'type': 'stat', 'name': stat_name, 'day': today, 'hour': now.hour})
         self.save()
     
+    def _before_flush(self):
+        # The snapshot covers every event logged so far
+        self.data['event_seq'] = self.events.seq
+    
+    def _after_flush(self):
+        self.events.compact()
+    
     def reset_daily_limits(self):
         """Reset rate limits daily"""
         today = datetime.now().strftime('%Y-%m-%d')
@@ -543,134 +581,32 @@ class TwitterBot:
     def __init__(self):
         self.data = BotData()
         self.tweet_queue = self.load_tweet_queue()
+        
+        # Reply template rotation (replaces the old recent_replies list)
+        self.data.data.pop('recent_replies', None)
+        self.reply_rotation = ReplyRotation(self.data.data.setdefault('reply_rotation', {}))
+        
+        # Repeat-free walk over the generator's template space
+        self.template_walk = TemplateWalk(self.data.data.setdefault('template_walk', {}))
+        
+        # Near-duplicate index over the full posting history
+        # (seeded once from the old posted_tweets list)
+        self.duplicate_index = DuplicateIndex(Path('duplicate_index.bin'))
+        posted_tweets = self.data.data.pop('posted_tweets', [])
+        if not len(self.duplicate_index):
+            for posted in posted_tweets:
+                self.duplicate_index.add(posted)
     
     def is_contextually_relevant(self, tweet_text, category, trigger_word=""):
         """
         Check if a tweet is contextually relevant before replying.
         Returns True only if the tweet is actually about the topic.
         """
-        tweet_lower = tweet_text.lower()
-        
-        # Context indicators that suggest the tweet is NOT about our topic
-        false_positives = {
-            'land': [
-                'landed', 'landing', 'airport', 'flight', 'plane', 'travel', 
-                'visiting', 'arrived', 'touched down', 'disembarked'
-            ],
-            'property': [
-                'property of', 'belongs to', 'owned by', 'copyright', 'intellectual property'
-            ],
-            'housing': [
-                'housing estate', 'housing complex', 'housing unit', 'housing project'
-            ],
-            'investment': [
-                'investment banking', 'investment firm', 'investment company', 
-                'investment advisor', 'investment manager'
-            ],
-            'betting': [
-                'betting odds', 'betting line', 'betting spread', 'betting market'
-            ]
-        }
-        
-        # Check for false positives
-        if category in false_positives:
-            for fp in false_positives[category]:
-                if fp in tweet_lower:
-                    # If it's a false positive, check if there are also relevant words
-                    relevant_words = {
-                        'land': ['buy', 'sell', 'own', 'purchase', 'invest', 'plot', 'acre', 'hectare', 'property', 'real estate'],
-                        'property': ['buy', 'sell', 'own', 'purchase', 'invest', 'real estate', 'land', 'house'],
-                        'housing': ['buy', 'sell', 'own', 'purchase', 'affordable', 'home', 'house'],
-                        'investment': ['buy', 'sell', 'invest', 'money', 'wealth', 'passive income', 'returns'],
-                        'betting': ['loss', 'lost', 'waste', 'regret', 'addiction', 'stop', 'quit']
-                    }
-                    
-                    # If no relevant words found, it's likely a false positive
-                    if category in relevant_words:
-                        has_relevant = any(word in tweet_lower for word in relevant_words[category])
-                        if not has_relevant:
-                            return False
-        
-        # Context indicators that suggest the tweet IS about our topic
-        positive_indicators = {
-            'betting': [
-                'lost money', 'betting loss', 'stop betting', 'gambling', 'waste', 
-                'regret', 'addiction', 'quit betting', 'lost on', 'lost to'
-            ],
-            'investment': [
-                'how to invest', 'where to invest', 'passive income', 'wealth building',
-                'investment opportunity', 'invest money', 'make money', 'earn money'
-            ],
-            'land': [
-                'buy land', 'sell land', 'own land', 'land ownership', 'land investment',
-                'affordable land', 'land for sale', 'real estate', 'property investment',
-                'land price', 'land value', 'plot of land'
-            ],
-            'co_ownership': [
-                'fractional ownership', 'co-ownership', 'shared ownership', 'group purchase',
-                'syndication', 'joint ownership', 'split ownership'
-            ]
-        }
-        
-        # Check for positive indicators
-        if category in positive_indicators:
-            has_positive = any(indicator in tweet_lower for indicator in positive_indicators[category])
-            if has_positive:
-                return True
-        
-        # For Ripple triggers, check if the trigger word appears in a relevant context
-        if trigger_word:
-            # Check if trigger appears with relevant surrounding words
-            trigger_index = tweet_lower.find(trigger_word)
-            if trigger_index != -1:
-                # Extract context around the trigger (50 chars before and after)
-                start = max(0, trigger_index - 50)
-                end = min(len(tweet_lower), trigger_index + len(trigger_word) + 50)
-                context = tweet_lower[start:end]
-                
-                # Check for context words that suggest relevance
-                context_words = {
-                    'nigeria development': ['build', 'develop', 'growth', 'progress', 'nation', 'country'],
-                    'real estate nigeria': ['buy', 'sell', 'own', 'property', 'land', 'house', 'investment'],
-                    'land': ['buy', 'sell', 'own', 'property', 'investment', 'plot', 'acre'],
-                    'housing': ['buy', 'sell', 'own', 'affordable', 'home', 'house', 'rent'],
-                    'youth': ['young', 'generation', 'future', 'opportunity', 'access', 'need'],
-                    'inflation': ['price', 'cost', 'money', 'economy', 'nigerian', 'naira'],
-                    'corruption': ['government', 'politician', 'leader', 'accountability', 'transparency']
-                }
-                
-                if trigger_word in context_words:
-                    has_context = any(word in context for word in context_words[trigger_word])
-                    if not has_context:
-                        return False
-        
-        # If we have a trigger word match but no clear context, be conservative
-        # Only reply if there are multiple relevant words or phrases
-        if trigger_word:
-            # Count relevant words/phrases
-            relevant_count = 0
-            if category == 'betting' and any(word in tweet_lower for word in ['money', 'loss', 'waste', 'regret']):
-                relevant_count += 1
-            if category == 'investment' and any(word in tweet_lower for word in ['money', 'invest', 'wealth', 'income']):
-                relevant_count += 1
-            if category == 'land' and any(word in tweet_lower for word in ['buy', 'sell', 'own', 'property', 'real estate']):
-                relevant_count += 1
-            if category == 'co_ownership' and any(word in tweet_lower for word in ['own', 'share', 'group', 'together']):
-                relevant_count += 1
-            
-            # Require at least 2 relevant indicators for ambiguous matches
-            if relevant_count < 2:
-                return False
-        
-        return True
+        return RELEVANCE_ENGINE.evaluate(tweet_text, category, trigger_word)
     
     def load_tweet_queue(self):
         """Load pre-written tweets from file"""
-        queue_file = Path('tweet_queue.json')
-        if queue_file.exists():
-            with open(queue_file, 'r') as f:
-                return json.load(f)
-        return []
+        return read_file('tweet_queue.json', [])
     
     def post_scheduled_tweet(self):
         """Post next tweet from queue or generate new one"""
@@ -679,78 +615,48 @@ class TwitterBot:
         use_generator = random.random() < 0.4
         
         if use_generator:
-            # Generate a new tweet
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                try:
-                    tweet_text = generate_tweet()
-                    
-                    # Check if we've posted something very similar recently
-                    if 'posted_tweets' not in self.data.data:
-                        self.data.data['posted_tweets'] = []
-                    
-                    # Check for exact duplicates and high similarity
-                    is_duplicate = False
-                    for posted in self.data.data['posted_tweets'][-100:]:  # Check last 100
-                        if tweet_text == posted:
-                            is_duplicate = True
-                            break
-                        # Check similarity (if 80%+ same words, consider duplicate)
-                        words1 = set(tweet_text.lower().split())
-                        words2 = set(posted.lower().split())
-                        if len(words1) > 0 and len(words2) > 0:
-                            similarity = len(words1 & words2) / max(len(words1), len(words2))
-                            if similarity > 0.8:
-                                is_duplicate = True
-                                break
-                    
-                    if not is_duplicate:
-                        break
-                    
-                    if attempt == max_attempts - 1:
-                        # Fall back to queue if can't generate unique
-                        use_generator = False
-                        break
-                except Exception as e:
-                    print(f"⚠️  Error generating tweet: {e}")
+            # Next unused template combination (no repeats until the space is exhausted)
+            try:
+                # Skip combinations too close to anything already posted
+                generated = self.template_walk.next_unique_tweet(self.duplicate_index.is_duplicate)
+                if generated is None:
                     use_generator = False
-                    break
-        else:
-            # Use pre-written queue
-            pass
-        
-        if not self.tweet_queue:
-            print("❌ No tweets in queue!")
-            return
-        
-        # Get current tweet with some randomization
-        index = self.data.data['current_tweet_index']
+                else:
+                    category, tweet_text = generated
+            except Exception as e:
+                print(f"⚠️  Error generating tweet: {e}")
+                use_generator = False
         
-        # 20% chance to skip ahead for more variety
-        if random.random() < 0.2 and len(self.tweet_queue) > 10:
-            skip = random.randint(1, min(5, len(self.tweet_queue) // 10))
-            index = (index + skip) % len(self.tweet_queue)
+        if not use_generator:
+            # Use pre-written queue (also the fallback when generation fails)
+            if not self.tweet_queue:
+                print("❌ No tweets in queue!")
+                return
             
-        if index >= len(self.tweet_queue):
-            index = 0  # Loop back to start
-        
-        tweet_text = self.tweet_queue[index]
-        self.data.data['current_tweet_index'] = (index + 1) % len(self.tweet_queue)
+            # Get current tweet with some randomization
+            index = self.data.data['current_tweet_index']
+            
+            # 20% chance to skip ahead for more variety
+            if random.random() < 0.2 and len(self.tweet_queue) > 10:
+                skip = random.randint(1, min(5, len(self.tweet_queue) // 10))
+                index = (index + skip) % len(self.tweet_queue)
+            
+            if index >= len(self.tweet_queue):
+                index = 0  # Loop back to start
+            
+            tweet_text = self.tweet_queue[index]
+            self.data.data['current_tweet_index'] = (index + 1) % len(self.tweet_queue)
         
         try:
             # Post tweet
             response = client.create_tweet(text=tweet_text)
             
-            # Track posted tweets (keep last 200)
-            if 'posted_tweets' not in self.data.data:
-                self.data.data['posted_tweets'] = []
-            self.data.data['posted_tweets'].append(tweet_text)
-            if len(self.data.data['posted_tweets']) > 200:
-                self.data.data['posted_tweets'] = self.data.data['posted_tweets'][-200:]
+            # Index posted tweet for near-duplicate checks
+            self.duplicate_index.add(tweet_text)
             
             self.data.increment_stat('total_tweets_posted')
             
-            source = "GENERATED" if use_generator else f"QUEUE ({index + 1}/{len(self.tweet_queue)})"
+            source = f"GENERATED ({category})" if use_generator else f"QUEUE ({index + 1}/{len(self.tweet_queue)})"
             print(f"✅ Posted tweet ({source})")
             print(f"   Content: {tweet_text[:50]}...")
             
@@ -793,7 +699,13 @@ class TwitterBot:
                     if not tweets.data:
                         continue
                     
-                    for tweet in tweets.data:
+                    # Normalize each tweet once; every matcher below reuses it
+                    candidates = [TweetCandidate(tweet) for tweet in tweets.data]
+                    
+                    # Evaluate context rules for the whole batch at once
+                    scans = RELEVANCE_ENGINE.scan_batch([c.normalized for c in candidates])
+                    
+                    for tweet, scan in zip(candidates, scans):
                         # Skip if already replied
                         if self.data.has_replied(tweet.id):
                             continue
@@ -803,35 +715,22 @@ class TwitterBot:
                         #     continue
                         
                         # Check if tweet contains engagement triggers or Ripple Effect triggers
-                        tweet_text = tweet.text.lower()
-                        original_tweet_text = tweet.text  # Keep original for context checking
-                        
-                        is_relevant = any(
-                            trigger in tweet_text 
-                            for trigger in ENGAGEMENT_TRIGGERS
-                        )
+                        is_relevant = ENGAGEMENT_MATCHER.any(tweet.normalized)
                         
                         # Check for Ripple Effect triggers
-                        has_ripple_trigger = any(
-                            trigger in tweet_text
-                            for trigger in RIPPLE_TRIGGERS.keys()
-                        )
+                        matching_trigger = RIPPLE_MATCHER.first(tweet.normalized)
                         
                         # Validate context before replying
                         should_reply = False
                         if is_relevant:
                             # Engagement triggers found - high relevance
-                            should_reply = self.is_contextually_relevant(original_tweet_text, category)
-                        elif has_ripple_trigger:
+                            should_reply = RELEVANCE_ENGINE.is_relevant(scan, category)
+                        elif matching_trigger:
                             # Ripple trigger found - check context
-                            matching_trigger = next(
-                                (trigger for trigger in RIPPLE_TRIGGERS.keys() if trigger in tweet_text),
-                                None
-                            )
-                            should_reply = self.is_contextually_relevant(original_tweet_text, category, matching_trigger)
+                            should_reply = RELEVANCE_ENGINE.is_relevant(scan, category, matching_trigger)
                         elif random.random() < 0.1:  # 10% of keyword matches (reduced from 30% to avoid spam)
                             # Random match - require strong context validation
-                            should_reply = self.is_contextually_relevant(original_tweet_text, category)
+                            should_reply = RELEVANCE_ENGINE.is_relevant(scan, category, require_indicator=True)
                         
                         if should_reply:
                             # Check daily limit
@@ -853,7 +752,7 @@ class TwitterBot:
                                 print(f"⚠️  Hourly reply limit reached ({replies_this_hour})")
                                 break
                             
-                            self.reply_to_tweet(tweet.id, category, tweet.text)
+                            self.reply_to_tweet(tweet.id, category, tweet.text, tweet.normalized)
                             
                             # Update hourly counter
                             if hour_key not in today_stats:
@@ -913,12 +812,14 @@ class TwitterBot:
                         if self.data.has_replied(tweet.id):
                             continue
                         
-                        tweet_text_lower = tweet.text.lower()
                         original_tweet_text = tweet.text  # Keep original for context checking
+                        normalized = normalize_text(original_tweet_text)
+                        scan = RELEVANCE_ENGINE.scan(normalized)
+                        matched_triggers = set(RIPPLE_MATCHER.matches(normalized))
                         
                         # Check for matching Ripple trigger
                         for trigger, replies in RIPPLE_TRIGGERS.items():
-                            if trigger in tweet_text_lower:
+                            if trigger in matched_triggers:
                                 # Validate context before replying
                                 # Determine category from trigger
                                 category = 'land'  # Default
@@ -930,32 +831,14 @@ class TwitterBot:
                                     category = 'land'
                                 
                                 # Check if tweet is contextually relevant
-                                if not self.is_contextually_relevant(original_tweet_text, category, trigger):
+                                if not RELEVANCE_ENGINE.is_relevant(scan, category, trigger):
                                     print(f"⏭️  Skipping tweet {tweet.id} - not contextually relevant")
                                     print(f"   Trigger: {trigger}")
                                     print(f"   Tweet: {original_tweet_text[:80]}...")
                                     continue
                                 
-                                # Initialize reply tracking if needed
-                                if 'recent_replies' not in self.data.data:
-                                    self.data.data['recent_replies'] = []
-                                
-                                # Filter out recently used replies (last 50)
-                                recent_replies = self.data.data['recent_replies'][-50:]
-                                unused_replies = [r for r in replies if r not in recent_replies]
-                                
-                                # If all replies were used recently, use all available (but shuffle)
-                                if not unused_replies:
-                                    unused_replies = replies.copy()
-                                    random.shuffle(unused_replies)
-                                
-                                reply_text = random.choice(unused_replies)
-                                
-                                # Track this reply
-                                self.data.data['recent_replies'].append(reply_text)
-                                if len(self.data.data['recent_replies']) > 100:  # Keep last 100
-                                    self.data.data['recent_replies'] = self.data.data['recent_replies'][-100:]
-                                self.data.save()
+                                # Select the least recently used reply (persisted with the reply stats)
+                                reply_text = self.reply_rotation.next_reply(replies)
                                 
                                 try:
                                     client.create_tweet(
@@ -999,54 +882,36 @@ class TwitterBot:
         except Exception as e:
             print(f"❌ Error in search_ripple_triggers: {e}")
     
-    def reply_to_tweet(self, tweet_id, category, tweet_text=""):
+    def reply_to_tweet(self, tweet_id, category, tweet_text="", normalized=None):
         """Reply to a specific tweet with duplicate prevention and context validation"""
         
+        # Reuse the caller's normalized text when it has one
+        if tweet_text and normalized is None:
+            normalized = normalize_text(tweet_text)
+        
         # Validate context before proceeding (if tweet text provided)
-        if tweet_text and not self.is_contextually_relevant(tweet_text, category):
+        if tweet_text and not self.is_contextually_relevant(normalized, category):
             print(f"⏭️  Skipping reply to {tweet_id} - not contextually relevant")
             print(f"   Category: {category}")
             print(f"   Tweet: {tweet_text[:80]}...")
             return
         
-        # Initialize reply tracking if needed
-        if 'recent_replies' not in self.data.data:
-            self.data.data['recent_replies'] = []
-        
         # Check for Ripple Effect triggers first
         reply_text = None
         available_replies = []
         matching_trigger = None
         
         if tweet_text:
-            tweet_lower = tweet_text.lower()
-            for trigger, replies in RIPPLE_TRIGGERS.items():
-                if trigger in tweet_lower:
-                    available_replies = replies
-                    matching_trigger = trigger
-                    break
+            matching_trigger = RIPPLE_MATCHER.first(normalized)
+            if matching_trigger:
+                available_replies = RIPPLE_TRIGGERS[matching_trigger]
         
         # Fall back to category-based replies
         if not available_replies:
             available_replies = REPLY_TEMPLATES.get(category, REPLY_TEMPLATES['land'])
         
-        # Filter out recently used replies (last 50)
-        recent_replies = self.data.data['recent_replies'][-50:]
-        unused_replies = [r for r in available_replies if r not in recent_replies]
-        
-        # If all replies were used recently, use all available (but shuffle)
-        if not unused_replies:
-            unused_replies = available_replies.copy()
-            random.shuffle(unused_replies)
-        
-        # Select reply
-        reply_text = random.choice(unused_replies)
-        
-        # Track this reply
-        self.data.data['recent_replies'].append(reply_text)
-        if len(self.data.data['recent_replies']) > 100:  # Keep last 100
-            self.data.data['recent_replies'] = self.data.data['recent_replies'][-100:]
-        self.data.save()
+        # Select the least recently used reply (persisted with the reply stats)
+        reply_text = self.reply_rotation.next_reply(available_replies)
         
         try:
             client.create_tweet(
@@ -1316,6 +1181,7 @@ def main():
     # Main loop
     while True:
         schedule.run_pending()
+        bot.data.flush_if_due()
         time.sleep(60)  # Check every minute
 
 
@@ -4,21 +4,32 @@ SubX Twitter Bot Core - Multi-user support
 Handles: Tweet scheduling, keyword monitoring, auto-replies, analytics
 """
 
-import tweepy
 import schedule
 import time
-import json
 import random
 from datetime import datetime
-from pathlib import Path
 import os
 from dotenv import load_dotenv
 import requests
 from bs4 import BeautifulSoup
 import re
-from tweet_generator import generate_tweet
-from credentials import CredentialManager
-from user_manager import UserManager
+from template_walk import TemplateWalk
+from twitter_clients import CLIENT_POOL
+from user_manager import get_user_manager
+from relevance import RELEVANCE_ENGINE
+from text_normalizer import PhraseMatcher, TweetCandidate, normalize_text
+from reply_rotation import ReplyRotation
+from duplicate_index import DuplicateIndex
+from replied_index import RepliedIndex
+from write_behind import WriteBehindStore
+from storage import get_storage
+from user_paths import user_dir
+from content_registry import CONTENT_REGISTRY, default_tweet_queue
+from tweet_queue_store import open_tweet_queue
+from event_log import EventLog
+from stats_series import StatsSeries
+from relevance_model import load_user_model, record_sample
+from engagement_registry import ENGAGEMENT_REGISTRY
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +40,8 @@ DEFAULT_CONFIG = {
     'posting_times': ['16:00', '20:00', '00:00', '04:00', '08:00', '12:00'],
     'engagement_interval': 15,  # minutes between engagement scans
     'max_replies_per_hour': 5,
+    'relevance_classifier': 'rules',  # 'rules' or 'model'
+    'relevance_threshold': 0.5,
 }
 
 # Keywords to monitor (organized by topic)
@@ -132,6 +145,11 @@ REPLY_TEMPLATES = {
     ]
 }
 
+
+def default_reply_templates():
+    """REPLY_TEMPLATES as the shared, read-only view handed to every bot"""
+    return CONTENT_REGISTRY.get('reply_templates', lambda: REPLY_TEMPLATES)
+
 # Engagement phrases to look for
 ENGAGEMENT_TRIGGERS = [
     'want to invest',
@@ -363,6 +381,10 @@ RIPPLE_TRIGGERS = {
     ]
 }
 
+# Compiled word-boundary matchers for the trigger lists above
+ENGAGEMENT_MATCHER = PhraseMatcher(ENGAGEMENT_TRIGGERS)
+RIPPLE_MATCHER = PhraseMatcher(RIPPLE_TRIGGERS)
+
 # Ripple Effect general replies
 RIPPLE_EFFECT_REPLIES = [
     "Ripple Effect theory: society trains its leaders long before elections. Change what we reward, and leadership quality changes over time.",
@@ -374,59 +396,89 @@ RIPPLE_EFFECT_REPLIES = [
 COMMUNITY_LINK = "https://x.com/i/communities/1951416110240149783"
 
 
-class BotData:
-    """Manages persistent bot data"""
+class BotData(WriteBehindStore):
+    """Manages persistent bot data (saves are coalesced, see write_behind)"""
     
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self.user_dir = Path('users') / user_id
+        self.user_dir = user_dir(user_id)
         self.user_dir.mkdir(parents=True, exist_ok=True)
         self.filepath = self.user_dir / 'bot_data.json'
+        self.storage = get_storage()
         self.data = self.load()
+        
+        # Replied tweet IDs live in a compact binary index
+        # (seeded once from the old replied_tweets list)
+        self.replied = RepliedIndex(self.user_dir / 'replied_tweets.bin')
+        replied_tweets = self.data.pop('replied_tweets', [])
+        if not len(self.replied):
+            for tweet_id in replied_tweets:
+                self.replied.add(tweet_id)
+        self.data['replied_tweets_count'] = len(self.replied)
+        
+        # Hourly/daily/monthly stat buckets with bounded retention
+        self.stats = StatsSeries(self.data)
+        self.stats.compact()
+        
+        # Stat changes are appended to an event log; replay any the snapshot misses
+        self.events = EventLog(self.user_dir / 'bot_events.jsonl')
+        replayed = 0
+        for event in self.events.replay(self.data.get('event_seq', 0)):
+            if event.get('type') == 'stat':
+                self._apply_stat(event['name'], event['day'], event.get('hour'))
+                replayed += 1
+        
+        self._init_write_behind()
+        if replayed:
+            self.save()
     
     def load(self):
-        """Load bot data from file"""
-        if Path(self.filepath).exists():
-            with open(self.filepath, 'r') as f:
-                return json.load(f)
+        """Load bot data from storage"""
+        data = self.storage.load_bot_data(self.user_id)
+        if data is not None:
+            return data
         return {
             'current_tweet_index': 0,
-            'replied_tweets': [],
             'daily_stats': {},
             'total_tweets_posted': 0,
             'total_replies_sent': 0,
             'last_reset': datetime.now().strftime('%Y-%m-%d')
         }
     
-    def save(self):
-        """Save bot data to file"""
-        with open(self.filepath, 'w') as f:
-            json.dump(self.data, f, indent=2)
-    
     def add_replied_tweet(self, tweet_id):
-        """Track replied tweets (keep last 1000)"""
-        self.data['replied_tweets'].append(str(tweet_id))
-        if len(self.data['replied_tweets']) > 1000:
-            self.data['replied_tweets'] = self.data['replied_tweets'][-1000:]
-        self.save()
+        """Track replied tweets (the index writes its own slot to disk)"""
+        self.replied.add(tweet_id)
+        self.data['replied_tweets_count'] = len(self.replied)
     
     def has_replied(self, tweet_id):
         """Check if we've already replied to this tweet"""
-        return str(tweet_id) in self.data['replied_tweets']
+        return tweet_id in self.replied
     
-    def increment_stat(self, stat_name):
-        """Increment a statistic counter"""
+    def _apply_stat(self, stat_name, day, hour=None):
         self.data[stat_name] = self.data.get(stat_name, 0) + 1
         
-        # Daily stats
-        today = datetime.now().strftime('%Y-%m-%d')
-        if today not in self.data['daily_stats']:
-            self.data['daily_stats'][today] = {}
-        self.data['daily_stats'][today][stat_name] = \
-            self.data['daily_stats'][today].get(stat_name, 0) + 1
-        
+        # Hourly, daily and monthly stats
+        self.stats.increment(stat_name, day, hour)
+    
+    def increment_stat(self, stat_name):
+        """Increment a statistic counter (logged now, snapshotted on flush)"""
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        with self._flush_lock:
+            self._apply_stat(stat_name, today, now.hour)
+            self.events.append({'type': 'stat', 'name': stat_name, 'day': today, 'hour': now.hour})
         self.save()
     
+    def _write_snapshot(self):
+        self.storage.save_bot_data(self.user_id, self.data)
+    
+    def _before_flush(self):
+        # The snapshot covers every event logged so far
+        self.data['event_seq'] = self.events.seq
+    
+    def _after_flush(self):
+        self.events.compact()
+    
     def reset_daily_limits(self):
         """Reset rate limits daily"""
         today = datetime.now().strftime('%Y-%m-%d')
@@ -445,17 +497,38 @@ class TwitterBot:
         self.data = BotData(user_id)
         self.tweet_queue = self.load_tweet_queue()
         
+        # Reply template rotation (replaces the old recent_replies list)
+        self.data.data.pop('recent_replies', None)
+        self.reply_rotation = ReplyRotation(self.data.data.setdefault('reply_rotation', {}))
+        
+        # Repeat-free walk over the generator's template space
+        self.template_walk = TemplateWalk(self.data.data.setdefault('template_walk', {}))
+        
+        # Near-duplicate index over the full posting history
+        # (seeded once from the old posted_tweets list)
+        self.duplicate_index = DuplicateIndex(self.data.user_dir / 'duplicate_index.bin')
+        posted_tweets = self.data.data.pop('posted_tweets', [])
+        if not len(self.duplicate_index):
+            for posted in posted_tweets:
+                self.duplicate_index.add(posted)
+        
         # Load user configuration
-        user_manager = UserManager()
-        user_config = user_manager.get_user_config(user_id)
+        user_config = get_user_manager().get_user_config(user_id)
         self.config = {
             'tweets_per_day': user_config.get('tweets_per_day', DEFAULT_CONFIG['tweets_per_day']),
             'posting_times': user_config.get('posting_times', DEFAULT_CONFIG['posting_times']),
             'engagement_interval': user_config.get('engagement_interval', DEFAULT_CONFIG['engagement_interval']),
             'max_replies_per_hour': user_config.get('max_replies_per_hour', DEFAULT_CONFIG['max_replies_per_hour']),
-            'keywords': user_config.get('keywords', {})
+            'keywords': user_config.get('keywords', {}),
+            'relevance_classifier': user_config.get('relevance_classifier', DEFAULT_CONFIG['relevance_classifier']),
+            'relevance_threshold': user_config.get('relevance_threshold', DEFAULT_CONFIG['relevance_threshold'])
         }
         
+        # Local relevance model, if the user selected it over the rule engine
+        self.relevance_model = None
+        if self.config['relevance_classifier'] == 'model':
+            self.relevance_model = load_user_model(user_id)
+        
         # Load user-specific reply templates
         self.reply_templates = self.load_reply_templates()
         
@@ -468,42 +541,34 @@ class TwitterBot:
     def _initialize_client(self):
         """Initialize Twitter client with user's credentials"""
         try:
-            cred_manager = CredentialManager(self.user_id)
-            credentials = cred_manager.load_credentials()
-            
-            return tweepy.Client(
-                bearer_token=credentials.get('bearer_token', ''),
-                consumer_key=credentials.get('api_key', ''),
-                consumer_secret=credentials.get('api_secret', ''),
-                access_token=credentials.get('access_token', ''),
-                access_token_secret=credentials.get('access_token_secret', ''),
-                wait_on_rate_limit=True
-            )
+            # Shared with restarts and other posts for this account
+            return CLIENT_POOL.get(self.user_id)
         except Exception as e:
             print(f"❌ Error initializing Twitter client for {self.user_id}: {e}")
             raise
     
+    def is_contextually_relevant(self, tweet_text, category, trigger_word=""):
+        """
+        Check if a tweet is contextually relevant before replying.
+        Returns True only if the tweet is actually about the topic.
+        """
+        return RELEVANCE_ENGINE.evaluate(tweet_text, category, trigger_word)
+    
     def load_tweet_queue(self):
-        """Load pre-written tweets from user-specific file"""
-        queue_file = Path('users') / self.user_id / 'tweet_queue.json'
-        if queue_file.exists():
-            with open(queue_file, 'r') as f:
-                return json.load(f)
-        # Fallback to default queue if user-specific doesn't exist
-        default_queue = Path('tweet_queue.json')
-        if default_queue.exists():
-            with open(default_queue, 'r') as f:
-                return json.load(f)
-        return []
+        """Load pre-written tweets for this user"""
+        tweet_queue = open_tweet_queue(self.user_id)
+        if tweet_queue is not None:
+            return tweet_queue
+        # Fallback to the shared default queue if user-specific doesn't exist
+        return default_tweet_queue()
     
     def load_reply_templates(self):
         """Load user-specific reply templates, fallback to defaults"""
-        templates_file = Path('users') / self.user_id / 'reply_templates.json'
-        if templates_file.exists():
-            with open(templates_file, 'r') as f:
-                return json.load(f)
-        # Fallback to default templates
-        return REPLY_TEMPLATES
+        reply_templates = get_storage().load_document(self.user_id, 'reply_templates')
+        if reply_templates is not None:
+            return reply_templates
+        # Fallback to the shared default templates
+        return default_reply_templates()
     
     def _setup_schedule(self):
         """Setup scheduled tasks for this bot instance"""
@@ -540,15 +605,13 @@ class TwitterBot:
     
     def check_scheduled_tweets(self):
         """Check for scheduled tweets that should be posted now"""
-        scheduled_file = Path('users') / self.user_id / 'scheduled_tweets.json'
-        if not scheduled_file.exists():
+        storage = get_storage()
+        scheduled_tweets = storage.load_scheduled_tweets(self.user_id)
+        if not scheduled_tweets:
             return
         
-        with open(scheduled_file, 'r') as f:
-            scheduled_tweets = json.load(f)
-        
         now = datetime.now()
-        updated = False
+        updates = []
         
         # Find tweets scheduled for this exact time (within 1 minute window)
         for scheduled in scheduled_tweets:
@@ -563,23 +626,27 @@ class TwitterBot:
                         tweet_text = scheduled['tweet']
                         try:
                             response = self.client.create_tweet(text=tweet_text)
-                            scheduled['status'] = 'posted'
-                            scheduled['posted_at'] = now.strftime('%Y-%m-%d %H:%M:%S')
-                            updated = True
+                            outcome = {'status': 'posted', 'posted_at': now.strftime('%Y-%m-%d %H:%M:%S')}
                             self.data.increment_stat('total_tweets_posted')
                             print(f"✅ Posted scheduled tweet: {tweet_text[:50]}...")
                         except Exception as e:
                             print(f"❌ Error posting scheduled tweet: {e}")
-                            scheduled['status'] = 'error'
-                            scheduled['error'] = str(e)
-                            updated = True
+                            outcome = {'status': 'error', 'error': str(e)}
+                        updates.append((dict(scheduled), outcome))
                 except ValueError:
                     # Invalid datetime format, skip
                     continue
         
-        if updated:
-            with open(scheduled_file, 'w') as f:
-                json.dump(scheduled_tweets, f, indent=2)
+        if updates:
+            # The list may have been edited meanwhile (web app): update our entries in place
+            def apply_updates(tweets):
+                for original, outcome in updates:
+                    for tweet in tweets:
+                        if tweet == original:
+                            tweet.update(outcome)
+                            break
+            
+            storage.update_scheduled_tweets(self.user_id, apply_updates)
     
     def post_scheduled_tweet(self):
         """Post next tweet from queue or generate new one"""
@@ -588,44 +655,20 @@ class TwitterBot:
         use_generator = random.random() < 0.4
         
         if use_generator:
-            # Generate a new tweet
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                try:
-                    tweet_text = generate_tweet()
-                    
-                    # Check if we've posted something very similar recently
-                    if 'posted_tweets' not in self.data.data:
-                        self.data.data['posted_tweets'] = []
-                    
-                    # Check for exact duplicates and high similarity
-                    is_duplicate = False
-                    for posted in self.data.data['posted_tweets'][-100:]:  # Check last 100
-                        if tweet_text == posted:
-                            is_duplicate = True
-                            break
-                        # Check similarity (if 80%+ same words, consider duplicate)
-                        words1 = set(tweet_text.lower().split())
-                        words2 = set(posted.lower().split())
-                        if len(words1) > 0 and len(words2) > 0:
-                            similarity = len(words1 & words2) / max(len(words1), len(words2))
-                            if similarity > 0.8:
-                                is_duplicate = True
-                                break
-                    
-                    if not is_duplicate:
-                        break
-                    
-                    if attempt == max_attempts - 1:
-                        # Fall back to queue if can't generate unique
-                        use_generator = False
-                        break
-                except Exception as e:
-                    print(f"⚠️  Error generating tweet: {e}")
+            # Next unused template combination (no repeats until the space is exhausted)
+            try:
+                # Skip combinations too close to anything already posted
+                generated = self.template_walk.next_unique_tweet(self.duplicate_index.is_duplicate)
+                if generated is None:
                     use_generator = False
-                    break
-        else:
-            # Use pre-written queue
+                else:
+                    category, tweet_text = generated
+            except Exception as e:
+                print(f"⚠️  Error generating tweet: {e}")
+                use_generator = False
+        
+        if not use_generator:
+            # Use pre-written queue (also the fallback when generation fails)
             if not self.tweet_queue:
                 print("❌ No tweets in queue!")
                 return
@@ -648,16 +691,12 @@ class TwitterBot:
             # Post tweet
             response = self.client.create_tweet(text=tweet_text)
             
-            # Track posted tweets (keep last 200)
-            if 'posted_tweets' not in self.data.data:
-                self.data.data['posted_tweets'] = []
-            self.data.data['posted_tweets'].append(tweet_text)
-            if len(self.data.data['posted_tweets']) > 200:
-                self.data.data['posted_tweets'] = self.data.data['posted_tweets'][-200:]
+            # Index posted tweet for near-duplicate checks
+            self.duplicate_index.add(tweet_text)
             
             self.data.increment_stat('total_tweets_posted')
             
-            source = "GENERATED" if use_generator else f"QUEUE ({index + 1}/{len(self.tweet_queue)})"
+            source = f"GENERATED ({category})" if use_generator else f"QUEUE ({index + 1}/{len(self.tweet_queue)})"
             print(f"✅ Posted tweet ({source})")
             print(f"   Content: {tweet_text[:50]}...")
             
@@ -690,36 +729,63 @@ class TwitterBot:
                     tweets = self.client.search_recent_tweets(
                         query=f"{keyword} -is:retweet -is:reply lang:en",
                         max_results=10,
-                        tweet_fields=['created_at', 'author_id', 'public_metrics']
+                        tweet_fields=['created_at', 'author_id', 'public_metrics', 'conversation_id']
                     )
                     
                     if not tweets.data:
                         continue
                     
-                    for tweet in tweets.data:
+                    # Normalize each tweet once; every matcher below reuses it
+                    candidates = [TweetCandidate(tweet) for tweet in tweets.data]
+                    
+                    # Evaluate context rules for the whole batch at once
+                    scans = RELEVANCE_ENGINE.scan_batch([c.normalized for c in candidates])
+                    
+                    # Score the whole batch with the local model when selected
+                    probabilities = None
+                    if self.relevance_model is not None:
+                        probabilities = self.relevance_model.score_batch(
+                            [c.normalized for c in candidates], category
+                        )
+                    
+                    for index, (tweet, scan) in enumerate(zip(candidates, scans)):
                         # Skip if already replied
                         if self.data.has_replied(tweet.id):
                             continue
                         
+                        # Skip if another of our accounts is engaging this tweet or thread
+                        if ENGAGEMENT_REGISTRY.is_taken(self.user_id, tweet.id, tweet.conversation_id):
+                            continue
+                        
                         # Skip low-engagement accounts (likely bots)
                         # if tweet.public_metrics['followers_count'] < 50:
                         #     continue
                         
                         # Check if tweet contains engagement triggers or Ripple Effect triggers
-                        tweet_text = tweet.text.lower()
-                        is_relevant = any(
-                            trigger in tweet_text 
-                            for trigger in ENGAGEMENT_TRIGGERS
-                        )
+                        is_relevant = ENGAGEMENT_MATCHER.any(tweet.normalized)
                         
                         # Check for Ripple Effect triggers
-                        has_ripple_trigger = any(
-                            trigger in tweet_text
-                            for trigger in RIPPLE_TRIGGERS.keys()
-                        )
+                        matching_trigger = RIPPLE_MATCHER.first(tweet.normalized)
+                        
+                        if probabilities is not None:
+                            should_reply = probabilities[index] >= self.config['relevance_threshold']
+                        else:
+                            # Validate context before replying
+                            if is_relevant:
+                                should_reply = RELEVANCE_ENGINE.is_relevant(scan, category)
+                            elif matching_trigger:
+                                should_reply = RELEVANCE_ENGINE.is_relevant(scan, category, matching_trigger)
+                            elif random.random() < 0.3:  # 30% of plain keyword matches
+                                # No trigger matched: only reply with a positive indicator
+                                should_reply = RELEVANCE_ENGINE.is_relevant(scan, category, require_indicator=True)
+                            else:
+                                continue
+                            if not should_reply:
+                                record_sample(self.user_id, tweet.text, category, 0, 'rules', tweet.id)
                         
-                        if is_relevant or has_ripple_trigger or random.random() < 0.3:  # 30% of all matches
-                            self.reply_to_tweet(tweet.id, category, tweet.text)
+                        if should_reply:
+                            self.reply_to_tweet(tweet.id, category, tweet.text, tweet.normalized,
+                                                tweet.conversation_id)
                             time.sleep(120)  # 2 min between replies
                     
                     time.sleep(10)  # Pause between keyword searches
@@ -762,7 +828,7 @@ class TwitterBot:
                     tweets = self.client.search_recent_tweets(
                         query=f"{keyword} -is:retweet -is:reply lang:en",
                         max_results=5,
-                        tweet_fields=['created_at', 'author_id', 'public_metrics', 'text']
+                        tweet_fields=['created_at', 'author_id', 'public_metrics', 'text', 'conversation_id']
                     )
                     
                     if not tweets.data:
@@ -772,31 +838,20 @@ class TwitterBot:
                         if self.data.has_replied(tweet.id):
                             continue
                         
-                        tweet_text_lower = tweet.text.lower()
+                        if ENGAGEMENT_REGISTRY.is_taken(self.user_id, tweet.id, tweet.conversation_id):
+                            continue
+                        
+                        matched_triggers = set(RIPPLE_MATCHER.matches(normalize_text(tweet.text)))
                         
                         # Check for matching Ripple trigger
                         for trigger, replies in RIPPLE_TRIGGERS.items():
-                            if trigger in tweet_text_lower:
-                                # Initialize reply tracking if needed
-                                if 'recent_replies' not in self.data.data:
-                                    self.data.data['recent_replies'] = []
+                            if trigger in matched_triggers:
+                                # Claim the tweet so our other accounts leave it alone
+                                if not ENGAGEMENT_REGISTRY.claim(self.user_id, tweet.id, tweet.conversation_id):
+                                    break
                                 
-                                # Filter out recently used replies (last 50)
-                                recent_replies = self.data.data['recent_replies'][-50:]
-                                unused_replies = [r for r in replies if r not in recent_replies]
-                                
-                                # If all replies were used recently, use all available (but shuffle)
-                                if not unused_replies:
-                                    unused_replies = replies.copy()
-                                    random.shuffle(unused_replies)
-                                
-                                reply_text = random.choice(unused_replies)
-                                
-                                # Track this reply
-                                self.data.data['recent_replies'].append(reply_text)
-                                if len(self.data.data['recent_replies']) > 100:  # Keep last 100
-                                    self.data.data['recent_replies'] = self.data.data['recent_replies'][-100:]
-                                self.data.save()
+                                # Select the least recently used reply (persisted with the reply stats)
+                                reply_text = self.reply_rotation.next_reply(replies)
                                 
                                 try:
                                     self.client.create_tweet(
@@ -804,6 +859,7 @@ class TwitterBot:
                                         in_reply_to_tweet_id=tweet.id
                                     )
                                     
+                                    ENGAGEMENT_REGISTRY.confirm(self.user_id, tweet.id, tweet.conversation_id)
                                     self.data.add_replied_tweet(tweet.id)
                                     self.data.increment_stat('total_replies_sent')
                                     
@@ -815,6 +871,7 @@ class TwitterBot:
                                     break  # Only one reply per tweet
                                     
                                 except Exception as e:
+                                    ENGAGEMENT_REGISTRY.release(self.user_id, tweet.id, tweet.conversation_id)
                                     print(f"❌ Error replying: {e}")
                         
                         time.sleep(10)
@@ -828,45 +885,32 @@ class TwitterBot:
         except Exception as e:
             print(f"❌ Error in search_ripple_triggers: {e}")
     
-    def reply_to_tweet(self, tweet_id, category, tweet_text=""):
+    def reply_to_tweet(self, tweet_id, category, tweet_text="", normalized=None, conversation_id=None):
         """Reply to a specific tweet with duplicate prevention"""
         
-        # Initialize reply tracking if needed
-        if 'recent_replies' not in self.data.data:
-            self.data.data['recent_replies'] = []
+        # Only one of our accounts engages a given tweet or conversation
+        if not ENGAGEMENT_REGISTRY.claim(self.user_id, tweet_id, conversation_id):
+            print(f"⏭️  Tweet {tweet_id} already claimed by another account")
+            return
         
         # Check for Ripple Effect triggers first
         reply_text = None
         available_replies = []
         
         if tweet_text:
-            tweet_lower = tweet_text.lower()
-            for trigger, replies in RIPPLE_TRIGGERS.items():
-                if trigger in tweet_lower:
-                    available_replies = replies
-                    break
+            # Reuse the caller's normalized text when it has one
+            if normalized is None:
+                normalized = normalize_text(tweet_text)
+            matching_trigger = RIPPLE_MATCHER.first(normalized)
+            if matching_trigger:
+                available_replies = RIPPLE_TRIGGERS[matching_trigger]
         
         # Fall back to category-based replies
         if not available_replies:
             available_replies = self.reply_templates.get(category, self.reply_templates.get('land', []))
         
-        # Filter out recently used replies (last 50)
-        recent_replies = self.data.data['recent_replies'][-50:]
-        unused_replies = [r for r in available_replies if r not in recent_replies]
-        
-        # If all replies were used recently, use all available (but shuffle)
-        if not unused_replies:
-            unused_replies = available_replies.copy()
-            random.shuffle(unused_replies)
-        
-        # Select reply
-        reply_text = random.choice(unused_replies)
-        
-        # Track this reply
-        self.data.data['recent_replies'].append(reply_text)
-        if len(self.data.data['recent_replies']) > 100:  # Keep last 100
-            self.data.data['recent_replies'] = self.data.data['recent_replies'][-100:]
-        self.data.save()
+        # Select the least recently used reply (persisted with the reply stats)
+        reply_text = self.reply_rotation.next_reply(available_replies)
         
         try:
             self.client.create_tweet(
@@ -874,14 +918,20 @@ class TwitterBot:
                 in_reply_to_tweet_id=tweet_id
             )
             
+            ENGAGEMENT_REGISTRY.confirm(self.user_id, tweet_id, conversation_id)
             self.data.add_replied_tweet(tweet_id)
             self.data.increment_stat('total_replies_sent')
             
+            # Replied tweets become training examples for the relevance model
+            if tweet_text:
+                record_sample(self.user_id, tweet_text, category, 1, 'reply', tweet_id)
+            
             print(f"✅ Replied to tweet {tweet_id}")
             print(f"   Category: {category}")
             print(f"   Reply: {reply_text[:50]}...")
             
         except Exception as e:
+            ENGAGEMENT_REGISTRY.release(self.user_id, tweet_id, conversation_id)
             print(f"❌ Error replying to {tweet_id}: {e}")
     
     def auto_like_mentions(self):
@@ -1062,6 +1112,11 @@ class TwitterBot:
         print(f"\nToday ({today}):")
         for key, value in today_stats.items():
             print(f"  {key}: {value}")
+        
+        # Generated tweet coverage per category
+        print("\nGenerated tweet coverage:")
+        for category, stats in self.template_walk.coverage().items():
+            print(f"  {category}: {stats['used']:,}/{stats['total']:,} ({stats['percent']}%, cycle {stats['cycle'] + 1})")
         print("="*50 + "\n")
 
 
@@ -1072,32 +1127,32 @@ class TwitterBot:
         print(f"🔍 Engagement scans: Every {self.config['engagement_interval']} minutes")
         print(f"💬 Max replies/hour: {self.config['max_replies_per_hour']}")
         print()
-    
-    # Print initial stats
+        
+        # Print initial stats
         self.print_stats()
-    
-    # Check if we missed any scheduled times today and post if needed
-    now = datetime.now()
-    current_time = now.strftime('%H:%M')
-    current_hour = now.hour
-    current_minute = now.minute
-    
-    print(f"⏰ Current time: {current_time}")
-    
-    # Check if any scheduled times have passed today
-    missed_times = []
+        
+        # Check if we missed any scheduled times today and post if needed
+        now = datetime.now()
+        current_time = now.strftime('%H:%M')
+        current_hour = now.hour
+        current_minute = now.minute
+        
+        print(f"⏰ Current time: {current_time}")
+        
+        # Check if any scheduled times have passed today
+        missed_times = []
         for post_time in self.config['posting_times']:
-        hour, minute = map(int, post_time.split(':'))
-        # If scheduled time has passed today, we missed it
-        if hour < current_hour or (hour == current_hour and minute <= current_minute):
-            missed_times.append(post_time)
-    
-    if missed_times:
-        print(f"⚠️  Missed scheduled times today: {missed_times}")
-        print("📝 Posting now to catch up...")
+            hour, minute = map(int, post_time.split(':'))
+            # If scheduled time has passed today, we missed it
+            if hour < current_hour or (hour == current_hour and minute <= current_minute):
+                missed_times.append(post_time)
+        
+        if missed_times:
+            print(f"⚠️  Missed scheduled times today: {missed_times}")
+            print("📝 Posting now to catch up...")
             self.post_scheduled_tweet()
-        print("✅ Caught up!\n")
-    
-    # Run initial engagement scan
-    print("🔍 Running initial engagement scan...")
+            print("✅ Caught up!\n")
+        
+        # Run initial engagement scan
+        print("🔍 Running initial engagement scan...")
         self.search_and_engage()
@@ -76,8 +76,9 @@ class BotManager:
             thread.join(timeout=5)
             del self.threads[user_id]
         
-        # Remove bot instance
+        # Remove bot instance, writing out any coalesced state first
         if user_id in self.bots:
+            self.bots[user_id].data.flush()
             del self.bots[user_id]
         
         return True
@@ -96,6 +97,7 @@ class BotManager:
                 try:
                     # Run pending scheduled tasks
                     schedule.run_pending()
+                    bot.data.flush_if_due()
                     time.sleep(60)  # Check every minute
                 except Exception as e:
                     print(f"❌ Error in bot loop for {user_id}: {e}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Bulk Users - Provision accounts and change configs for many users at once
+Each command is applied as one batch with a single save.
+
+Usage:
+    python3 bulk_users.py create <accounts.csv|accounts.json> [preset]
+    python3 bulk_users.py config <config.json> [user_id ...]
+    python3 bulk_users.py preset <preset|none> [user_id ...]
+
+Accounts files list user_id, username and optionally email, twitter_id
+and preset (CSV with a header row, or a JSON list of objects). config and
+preset apply to the given users, or to every user if none are given.
+"""
+
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from user_manager import get_user_manager
+
+
+def read_accounts(path: str) -> list:
+    """Accounts from a CSV (with header) or JSON file"""
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        with open(path) as f:
+            return json.load(f)
+    with open(path, newline='') as f:
+        return [
+            {key: value for key, value in row.items() if value not in (None, '')}
+            for row in csv.DictReader(f)
+        ]
+
+
+def create(accounts_file: str, preset: str = None):
+    accounts = read_accounts(accounts_file)
+    start = time.perf_counter()
+    users = get_user_manager().create_users(accounts, preset=preset)
+    print(f"✅ Created {len(users):,} users in {time.perf_counter() - start:.2f}s")
+
+
+def _target_users(user_ids: list) -> list:
+    return user_ids or [user['user_id'] for user in get_user_manager().list_users()]
+
+
+def update_config(config_file: str, user_ids: list):
+    with open(config_file) as f:
+        config = json.load(f)
+    user_ids = _target_users(user_ids)
+    start = time.perf_counter()
+    get_user_manager().update_users_config(user_ids, config)
+    print(f"✅ Updated config for {len(user_ids):,} users in {time.perf_counter() - start:.2f}s")
+
+
+def set_preset(preset: str, user_ids: list):
+    user_ids = _target_users(user_ids)
+    start = time.perf_counter()
+    get_user_manager().set_users_preset(user_ids, None if preset == 'none' else preset)
+    print(f"✅ Set preset '{preset}' for {len(user_ids):,} users in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'create':
+        create(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'config':
+        update_config(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'preset':
+        set_preset(sys.argv[2], sys.argv[3:])
+    else:
+        print(__doc__.split('Usage:')[1].split('\n\n')[0].rstrip())
+        sys.exit(1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Config Layers - Bot configuration resolved from layers
+global defaults -> preset (plan or team) -> per-user overrides
+
+Users store only their overrides, so default changes reach everyone who
+hasn't changed that setting. Nested dicts (e.g. keywords) merge per key;
+lists and other values replace; an override of None removes the key.
+"""
+
+from typing import Optional
+
+from content_registry import freeze, thaw
+
+DEFAULT_BOT_CONFIG = {
+    'tweets_per_day': 6,
+    'posting_times': ['16:00', '20:00', '00:00', '04:00', '08:00', '12:00'],
+    'engagement_interval': 15,  # minutes
+    'max_replies_per_hour': 5,
+    'relevance_classifier': 'rules',  # 'rules' or 'model'
+    'relevance_threshold': 0.5,
+    'keywords': {
+        'betting': [
+            'betting loss Nigeria',
+            'lost money betting',
+            'stop betting',
+            'gambling addiction',
+            'bet9ja losses',
+            'sports betting',
+            'sports betting waste',
+            'betking loss',
+            'sportybet loss',
+            'bet9ja regret'
+        ],
+        'investment': [
+            'how to invest Nigeria',
+            'passive income Nigeria',
+            'investment opportunities',
+            'investment opportunities Nigeria',
+            'where to invest',
+            'where to invest Nigeria',
+            'wealth building',
+            'small money investment'
+        ],
+        'land': [
+            'buy land Lagos',
+            'buy land Abeokuta',
+            'land ownership Nigeria',
+            'affordable land',
+            'affordable land Nigeria',
+            'land investment',
+            'real estate Lagos',
+            'farmland Nigeria',
+            'real estate investment Nigeria',
+            'property investment Nigeria'
+        ],
+        'co_ownership': [
+            'fractional ownership',
+            'fractional ownership Nigeria',
+            'co-ownership property',
+            'shared ownership',
+            'shared ownership real estate',
+            'real estate syndication',
+            'group land purchase'
+        ]
+    }
+}
+
+# Plan / team presets, applied on top of the defaults
+PRESETS = {
+    'conservative': {
+        'tweets_per_day': 3,
+        'posting_times': ['09:00', '15:00', '21:00'],
+        'engagement_interval': 30,
+        'max_replies_per_hour': 2,
+        'relevance_threshold': 0.7
+    },
+    'growth': {
+        'tweets_per_day': 10,
+        'posting_times': ['06:00', '08:00', '10:00', '12:00', '14:00',
+                          '16:00', '18:00', '20:00', '22:00', '00:00'],
+        'engagement_interval': 10,
+        'max_replies_per_hour': 8
+    },
+    'real_estate': {
+        'keywords': {'betting': None}
+    }
+}
+
+
+def merge_config(base: dict, overrides: dict) -> dict:
+    """base with overrides applied (neither is modified)"""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def config_delta(config: dict, base: dict) -> dict:
+    """Smallest overrides that turn base into config"""
+    delta = {}
+    for key, value in config.items():
+        base_value = base.get(key)
+        if isinstance(value, dict) and isinstance(base_value, dict):
+            nested = config_delta(value, base_value)
+            if nested:
+                delta[key] = nested
+        elif value != base_value or key not in base:
+            delta[key] = value
+    for key in base:
+        if key not in config:
+            delta[key] = None
+    return delta
+
+
+def base_config(preset: Optional[str] = None) -> dict:
+    """Defaults with the preset applied: what a user with no overrides gets"""
+    if preset and preset not in PRESETS:
+        print(f"⚠️  Unknown config preset '{preset}', using defaults")
+    return merge_config(DEFAULT_BOT_CONFIG, PRESETS.get(preset) or {})
+
+
+def resolve_config(overrides: Optional[dict] = None, preset: Optional[str] = None):
+    """Read-only effective config for a user"""
+    return freeze(merge_config(base_config(preset), thaw(overrides or {})))
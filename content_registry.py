@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Content Registry - Process-wide, read-only default content
+The default tweet queue and reply templates are loaded once and shared by
+every bot and request as immutable views. Callers that customize content
+copy it first (copy-on-write) and save the copy as the user's own.
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+
+def freeze(value: Any) -> Any:
+    """Immutable view of JSON-like content (dicts -> mappings, lists -> tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable copy of frozen content, for a user to customize"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ContentRegistry:
+    """Frozen content by name, loaded once per process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._content: Dict[str, Any] = {}
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Frozen content for name, calling loader the first time"""
+        content = self._content.get(name)
+        if content is None:
+            with self._lock:
+                content = self._content.get(name)
+                if content is None:
+                    content = self._content[name] = freeze(loader())
+        return content
+
+    def invalidate(self, name: str = None):
+        """Drop cached content so it is reloaded on next use"""
+        with self._lock:
+            if name is None:
+                self._content.clear()
+            else:
+                self._content.pop(name, None)
+
+
+# Shared by every bot and request in this process
+CONTENT_REGISTRY = ContentRegistry()
+
+
+def default_tweet_queue() -> Tuple[str, ...]:
+    """The shared default tweet queue"""
+    from storage import get_storage
+    return CONTENT_REGISTRY.get(
+        'tweet_queue', lambda: get_storage().load_document(None, 'tweet_queue') or []
+    )
+
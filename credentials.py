@@ -6,6 +6,8 @@ Uses Fernet symmetric encryption for credential storage
 
 import os
 import json
+import threading
+import time
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -13,9 +15,22 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import base64
 from dotenv import load_dotenv
+from read_cache import file_stamp
+from user_paths import user_dir
 
 load_dotenv()
 
+# One cipher per process: key derivation runs 100k PBKDF2 iterations
+_cipher = None
+_cipher_source = None
+_cipher_lock = threading.Lock()
+
+# Decrypted credentials by file, kept for CREDENTIALS_TTL seconds and
+# dropped early if the file changes (e.g. saved by another worker)
+CREDENTIALS_TTL = float(os.getenv('CREDENTIALS_TTL', 300))
+_decrypted = {}
+_decrypted_lock = threading.Lock()
+
 # Get encryption key from environment or generate one
 def get_or_create_key():
     """Get encryption key from environment or generate a new one"""
@@ -64,18 +79,30 @@ def derive_key_from_password(password: str):
     key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
     return key
 
+def get_cipher() -> Fernet:
+    """Process-wide Fernet cipher, rebuilt only if ENCRYPTION_KEY changes"""
+    global _cipher, _cipher_source
+    source = os.getenv('ENCRYPTION_KEY')
+    cipher = _cipher
+    if cipher is not None and _cipher_source == source:
+        return cipher
+    with _cipher_lock:
+        if _cipher is None or _cipher_source != source:
+            _cipher = Fernet(get_or_create_key())
+            _cipher_source = source
+        return _cipher
+
 class CredentialManager:
     """Manages encrypted storage of Twitter API credentials"""
     
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self.user_dir = Path('users') / user_id
+        self.user_dir = user_dir(user_id)
         self.user_dir.mkdir(parents=True, exist_ok=True)
         self.credential_file = self.user_dir / 'credentials.enc'
         
-        # Get or create encryption key
-        key = get_or_create_key()
-        self.cipher = Fernet(key)
+        # Shared cipher (key is read or derived once per process)
+        self.cipher = get_cipher()
     
     def save_credentials(self, credentials: dict):
         """
@@ -98,12 +125,22 @@ class CredentialManager:
         # Save to file
         with open(self.credential_file, 'wb') as f:
             f.write(encrypted_data)
+        self._forget()
     
     def load_credentials(self) -> dict:
         """Load and decrypt Twitter credentials"""
-        if not self.credential_file.exists():
+        stamp = file_stamp(self.credential_file)
+        if stamp is None:
             raise FileNotFoundError(f"No credentials found for user {self.user_id}")
         
+        with _decrypted_lock:
+            cached = _decrypted.get(self.credential_file)
+            if cached is not None:
+                if cached[0] == stamp and cached[1] > time.monotonic():
+                    return dict(cached[2])
+                # Expired or stale: don't keep plaintext tokens around
+                del _decrypted[self.credential_file]
+        
         # Read encrypted file
         with open(self.credential_file, 'rb') as f:
             encrypted_data = f.read()
@@ -112,9 +149,22 @@ class CredentialManager:
         try:
             decrypted_data = self.cipher.decrypt(encrypted_data)
             credentials = json.loads(decrypted_data.decode())
-            return credentials
         except Exception as e:
             raise ValueError(f"Failed to decrypt credentials: {e}")
+        
+        now = time.monotonic()
+        with _decrypted_lock:
+            for path in [path for path, entry in _decrypted.items() if entry[1] <= now]:
+                del _decrypted[path]
+            _decrypted[self.credential_file] = (stamp, now + CREDENTIALS_TTL, credentials)
+        return dict(credentials)
+    
+    def _forget(self):
+        """Drop this user's decrypted credentials and pooled client"""
+        with _decrypted_lock:
+            _decrypted.pop(self.credential_file, None)
+        from twitter_clients import CLIENT_POOL  # imports this module
+        CLIENT_POOL.invalidate(self.user_id)
     
     def has_credentials(self) -> bool:
         """Check if credentials exist for this user"""
@@ -124,6 +174,7 @@ class CredentialManager:
         """Delete stored credentials"""
         if self.credential_file.exists():
             self.credential_file.unlink()
+        self._forget()
     
     def save_oauth_tokens(self, oauth_token: str, oauth_token_secret: str, 
                          api_key: str = None, api_secret: str = None):
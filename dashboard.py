@@ -4,8 +4,7 @@ SubX Twitter Bot Dashboard
 View statistics, manage queue, and control bot
 """
 
-import json
-from pathlib import Path
+from serializer import read_file, write_file
 from datetime import datetime
 import sys
 
@@ -16,21 +15,14 @@ class Dashboard:
     
     def load_data(self):
         """Load bot data"""
-        data_file = Path('bot_data.json')
-        if data_file.exists():
-            with open(data_file, 'r') as f:
-                self.data = json.load(f)
-        else:
-            self.data = None
+        self.data = read_file('bot_data.json')
+        if self.data is None:
             print("⚠️  No bot data found. Bot hasn't run yet.")
     
     def load_queue(self):
         """Load tweet queue"""
-        queue_file = Path('tweet_queue.json')
-        if queue_file.exists():
-            with open(queue_file, 'r') as f:
-                self.queue = json.load(f)
-        else:
+        self.queue = read_file('tweet_queue.json')
+        if self.queue is None:
             self.queue = []
             print("⚠️  No tweet queue found.")
     
@@ -47,7 +39,7 @@ class Dashboard:
         print(f"\n📈 Overall Performance:")
         print(f"   Total Tweets Posted: {self.data.get('total_tweets_posted', 0)}")
         print(f"   Total Replies Sent: {self.data.get('total_replies_sent', 0)}")
-        print(f"   Tweets Replied To: {len(self.data.get('replied_tweets', []))}")
+        print(f"   Tweets Replied To: {self.data.get('replied_tweets_count', len(self.data.get('replied_tweets', [])))}")
         
         print(f"\n📅 Queue Status:")
         print(f"   Current Position: {self.data.get('current_tweet_index', 0)}/{len(self.queue)}")
@@ -93,16 +85,14 @@ class Dashboard:
     def add_tweet(self, tweet_text):
         """Add a new tweet to the queue"""
         self.queue.append(tweet_text)
-        with open('tweet_queue.json', 'w') as f:
-            json.dump(self.queue, f, indent=2)
+        write_file('tweet_queue.json', self.queue)
         print(f"✅ Added tweet to queue (position {len(self.queue)})")
     
     def remove_tweet(self, index):
         """Remove a tweet from the queue"""
         if 0 <= index < len(self.queue):
             removed = self.queue.pop(index)
-            with open('tweet_queue.json', 'w') as f:
-                json.dump(self.queue, f, indent=2)
+            write_file('tweet_queue.json', self.queue)
             print(f"✅ Removed: {removed[:50]}...")
         else:
             print(f"❌ Invalid index. Queue has {len(self.queue)} tweets.")
@@ -111,8 +101,7 @@ class Dashboard:
         """Reset queue to beginning"""
         if self.data:
             self.data['current_tweet_index'] = 0
-            with open('bot_data.json', 'w') as f:
-                json.dump(self.data, f, indent=2)
+            write_file('bot_data.json', self.data)
             print("✅ Reset queue to beginning")
         else:
             print("❌ No bot data to reset")
@@ -132,7 +121,10 @@ class Dashboard:
             f.write(f"Overall,Total Tweets Posted,{self.data.get('total_tweets_posted', 0)}\n")
             f.write(f"Overall,Total Replies Sent,{self.data.get('total_replies_sent', 0)}\n")
             
-            # Daily stats
+            # Monthly rollups (older than the daily window), then daily stats
+            for month, stats in sorted(self.data.get('monthly_stats', {}).items()):
+                for metric, value in stats.items():
+                    f.write(f"{month},{metric},{value}\n")
             for date, stats in self.data.get('daily_stats', {}).items():
                 for metric, value in stats.items():
                     f.write(f"{date},{metric},{value}\n")
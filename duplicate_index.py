@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Duplicate Index - MinHash/LSH near-duplicate detection for posted tweets
+Keeps a signature for every tweet ever posted in an append-only binary file
+and answers "have we posted something like this?" with a few bucket lookups
+"""
+
+import random
+import zlib
+from array import array
+from pathlib import Path
+from typing import List
+
+from text_normalizer import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.67  # estimated Jaccard (~80% shared words)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: stored signatures must stay comparable across restarts
+_rng = random.Random(20240501)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERM)
+]
+
+
+def minhash_signature(text: str) -> List[int]:
+    """MinHash signature of the tweet's word set"""
+    shingles = {zlib.crc32(word.encode()) for word in tokenize(text)}
+    if not shingles:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * shingle + b) % _MERSENNE_PRIME) & _MAX_HASH for shingle in shingles)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+class DuplicateIndex:
+    """Persistent MinHash signature index with LSH buckets"""
+
+    RECORD_SIZE = 1 + NUM_PERM  # exact text hash + signature
+
+    def __init__(self, filepath):
+        self.filepath = Path(filepath)
+        self.signatures: List[array] = []
+        self.exact = set()
+        self.buckets = {}  # (band, band values) -> record numbers
+        self.load()
+
+    def load(self):
+        """Load signatures and rebuild the in-memory buckets"""
+        if not self.filepath.exists():
+            return
+        records = array('I')
+        with open(self.filepath, 'rb') as f:
+            records.frombytes(f.read())
+        usable = len(records) - len(records) % self.RECORD_SIZE
+        for start in range(0, usable, self.RECORD_SIZE):
+            self._index(records[start], records[start + 1:start + self.RECORD_SIZE])
+
+    def _index(self, text_hash: int, signature):
+        record = len(self.signatures)
+        self.signatures.append(signature)
+        self.exact.add(text_hash)
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            self.buckets.setdefault(key, []).append(record)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def is_duplicate(self, text: str, threshold: float = SIMILARITY_THRESHOLD) -> bool:
+        """Check for an exact or near-duplicate of text in the whole history"""
+        if zlib.crc32(text.encode()) in self.exact:
+            return True
+
+        signature = minhash_signature(text)
+        if signature[0] == _MAX_HASH:
+            return False
+
+        checked = set()
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            for record in self.buckets.get(key, ()):
+                if record in checked:
+                    continue
+                checked.add(record)
+                stored = self.signatures[record]
+                matches = sum(1 for x, y in zip(signature, stored) if x == y)
+                if matches / NUM_PERM >= threshold:
+                    return True
+        return False
+
+    def add(self, text: str):
+        """Index a posted tweet and append it to the signature file"""
+        text_hash = zlib.crc32(text.encode())
+        signature = array('I', minhash_signature(text))
+        self._index(text_hash, signature)
+
+        record = array('I', [text_hash])
+        record.extend(signature)
+        with open(self.filepath, 'ab') as f:
+            f.write(record.tobytes())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Engagement Registry - Shared record of tweets our accounts are engaging
+Bots running in the same process claim a tweet (and its conversation)
+before replying, so only one account engages it
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+CLAIM_TTL = 15 * 60          # seconds a claim holds while a reply is in flight
+ENGAGED_TTL = 3 * 24 * 3600  # seconds an engaged tweet/conversation stays taken
+
+
+class EngagementRegistry:
+    """Thread-safe claims and engagements keyed by tweet and conversation ID"""
+
+    def __init__(self, claim_ttl: float = CLAIM_TTL, engaged_ttl: float = ENGAGED_TTL):
+        self.claim_ttl = claim_ttl
+        self.engaged_ttl = engaged_ttl
+        self._lock = threading.Lock()
+        # key -> (user_id, expires_at); insertion order is expiry order
+        self._claims = OrderedDict()
+        self._engaged = OrderedDict()
+
+    @staticmethod
+    def _keys(tweet_id, conversation_id=None):
+        keys = [('tweet', str(tweet_id))]
+        if conversation_id and str(conversation_id) != str(tweet_id):
+            keys.append(('conversation', str(conversation_id)))
+        return keys
+
+    @staticmethod
+    def _prune(entries: OrderedDict, now: float):
+        while entries:
+            key, (_, expires_at) = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            del entries[key]
+
+    def _holder(self, key, now: float) -> Optional[str]:
+        for entries in (self._engaged, self._claims):
+            entry = entries.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+        return None
+
+    def is_taken(self, user_id: str, tweet_id, conversation_id=None) -> bool:
+        """Check if another account has claimed or engaged this tweet"""
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(tweet_id, conversation_id):
+                holder = self._holder(key, now)
+                if holder is not None and holder != user_id:
+                    return True
+        return False
+
+    def claim(self, user_id: str, tweet_id, conversation_id=None) -> bool:
+        """Claim a tweet for user_id; False if another account holds it"""
+        now = time.monotonic()
+        keys = self._keys(tweet_id, conversation_id)
+        with self._lock:
+            self._prune(self._claims, now)
+            self._prune(self._engaged, now)
+            for key in keys:
+                holder = self._holder(key, now)
+                if holder is not None and holder != user_id:
+                    return False
+            for key in keys:
+                self._claims.pop(key, None)
+                self._claims[key] = (user_id, now + self.claim_ttl)
+        return True
+
+    def confirm(self, user_id: str, tweet_id, conversation_id=None):
+        """Mark a claimed tweet as engaged after a successful reply"""
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(tweet_id, conversation_id):
+                self._claims.pop(key, None)
+                self._engaged.pop(key, None)
+                self._engaged[key] = (user_id, now + self.engaged_ttl)
+
+    def release(self, user_id: str, tweet_id, conversation_id=None):
+        """Drop user_id's claim after a failed reply"""
+        with self._lock:
+            for key in self._keys(tweet_id, conversation_id):
+                entry = self._claims.get(key)
+                if entry and entry[0] == user_id:
+                    del self._claims[key]
+
+
+# Shared by every bot running in this process
+ENGAGEMENT_REGISTRY = EngagementRegistry()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Event Log - Append-only JSONL log of state changes
+Each change is written as one line; a snapshot of the full state records
+the last sequence number it includes, after which the log is compacted
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+
+class EventLog:
+    """Sequence-numbered append-only event file"""
+
+    def __init__(self, filepath):
+        self.filepath = Path(filepath)
+        self.seq = 0
+
+    def replay(self, after_seq: int = 0) -> Iterator[dict]:
+        """Yield logged events newer than after_seq, oldest first"""
+        self.seq = max(self.seq, after_seq)
+        if not self.filepath.exists():
+            return
+        with open(self.filepath, 'r') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append
+                    print(f"⚠️  Skipping incomplete event in {self.filepath}")
+                    continue
+                if event.get('seq', 0) <= after_seq:
+                    continue
+                self.seq = max(self.seq, event['seq'])
+                yield event
+
+    def append(self, event: dict) -> int:
+        """Log an event, returning its sequence number"""
+        self.seq += 1
+        event['seq'] = self.seq
+        with open(self.filepath, 'a') as f:
+            f.write(json.dumps(event, separators=(',', ':')) + '\n')
+        return self.seq
+
+    def compact(self):
+        """Drop logged events once a snapshot includes all of them"""
+        if self.filepath.exists() and self.filepath.stat().st_size:
+            open(self.filepath, 'w').close()
@@ -8,6 +8,7 @@ import shutil
 from pathlib import Path
 from user_manager import UserManager
 from credentials import CredentialManager
+from user_paths import user_dir
 import os
 from dotenv import load_dotenv
 
@@ -23,8 +24,8 @@ def migrate():
     
     # Default user ID
     default_user_id = "default_user"
-    default_user_dir = users_dir / default_user_id
-    default_user_dir.mkdir(exist_ok=True)
+    default_user_dir = user_dir(default_user_id)
+    default_user_dir.mkdir(parents=True, exist_ok=True)
     
     # Migrate bot_data.json
     old_bot_data = Path('bot_data.json')
@@ -32,7 +33,7 @@ def migrate():
     if old_bot_data.exists() and not new_bot_data.exists():
         print(f"📦 Migrating bot_data.json...")
         shutil.copy(old_bot_data, new_bot_data)
-        print(f"✅ Migrated bot_data.json to users/{default_user_id}/bot_data.json")
+        print(f"✅ Migrated bot_data.json to {default_user_dir}/bot_data.json")
     elif new_bot_data.exists():
         print(f"ℹ️  Bot data already exists for default user")
     
@@ -42,7 +43,7 @@ def migrate():
     if old_queue.exists() and not new_queue.exists():
         print(f"📦 Migrating tweet_queue.json...")
         shutil.copy(old_queue, new_queue)
-        print(f"✅ Migrated tweet_queue.json to users/{default_user_id}/tweet_queue.json")
+        print(f"✅ Migrated tweet_queue.json to {default_user_dir}/tweet_queue.json")
     elif new_queue.exists():
         print(f"ℹ️  Tweet queue already exists for default user")
     
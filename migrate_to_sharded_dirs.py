@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Migration Script - Move flat users/<user_id>/ directories into the
+hash fan-out users/ab/cd/<user_id>/
+
+Stop the web app and all bots first: files are moved, not copied.
+
+Usage:
+    python3 migrate_to_sharded_dirs.py [users dir]
+"""
+
+import os
+import sys
+from pathlib import Path
+from user_paths import USERS_DIR, _is_fanout_dir, _resolve, sharded_user_dir
+
+
+def migrate(users_dir: Path = USERS_DIR):
+    """Rename each flat user directory to its sharded location"""
+    users_dir = Path(users_dir)
+    print(f"🔄 Moving user directories in {users_dir}/ into the sharded layout...")
+
+    if not users_dir.exists():
+        print(f"ℹ️  {users_dir}/ does not exist, nothing to migrate")
+        return
+
+    legacy_dirs = [
+        path for path in sorted(users_dir.iterdir())
+        if path.is_dir() and not _is_fanout_dir(path)
+    ]
+    print(f"👤 Found {len(legacy_dirs)} flat user directories")
+
+    moved = 0
+    for path in legacy_dirs:
+        target = sharded_user_dir(path.name, users_dir)
+        if target.exists():
+            print(f"⚠️  {target} already exists, leaving {path} in place")
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Same filesystem, so this is a rename: atomic and no data copied
+        os.rename(path, target)
+        moved += 1
+
+    _resolve.cache_clear()
+    print(f"\n✅ Migration complete! Moved {moved} user directories")
+
+
+if __name__ == "__main__":
+    migrate(sys.argv[1] if len(sys.argv) > 1 else USERS_DIR)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migration Script - Copy JSON state files into the SQLite storage backend
+
+Usage:
+    python3 migrate_to_sqlite.py [database path]
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+from storage import DEFAULT_SQLITE_PATH, JsonStorage, SqliteStorage
+from user_paths import iter_user_dirs
+
+load_dotenv()
+
+DOCUMENTS = ('tweet_queue', 'reply_templates')
+
+
+def migrate(db_path: str):
+    """Copy users, bot data, scheduled tweets and documents into SQLite"""
+    print(f"🔄 Migrating JSON storage to SQLite ({db_path})...")
+
+    source = JsonStorage()
+    target = SqliteStorage(db_path)
+
+    # Shared default queue
+    default_queue = source.load_document(None, 'tweet_queue')
+    if default_queue is not None:
+        target.save_document(None, 'tweet_queue', default_queue)
+        print(f"✅ Migrated default tweet_queue.json ({len(default_queue)} tweets)")
+
+    users = source.load_users()
+    print(f"👤 Found {len(users)} users")
+
+    # Users without an account entry can still have bot data on disk
+    user_ids = list(users)
+    user_ids += sorted(
+        path.name for path in iter_user_dirs(source.users_dir)
+        if path.name not in users
+    )
+
+    for user_id in user_ids:
+        if user_id in users:
+            target.put_user(user_id, users[user_id])
+
+        migrated = []
+        bot_data = source.load_bot_data(user_id)
+        if bot_data is not None:
+            target.save_bot_data(user_id, bot_data)
+            migrated.append('bot data')
+
+        scheduled_tweets = source.load_scheduled_tweets(user_id)
+        if scheduled_tweets:
+            target.save_scheduled_tweets(user_id, scheduled_tweets)
+            migrated.append(f'{len(scheduled_tweets)} scheduled tweets')
+
+        for name in DOCUMENTS:
+            value = source.load_document(user_id, name)
+            if value is not None:
+                target.save_document(user_id, name, value)
+                migrated.append(name)
+
+        print(f"✅ {user_id}: {', '.join(migrated) if migrated else 'account only'}")
+
+    print("\n✅ Migration complete!")
+    print("\n📝 Next steps:")
+    print(f"   1. Set STORAGE_BACKEND=sqlite and SQLITE_PATH={db_path} in .env")
+    print("   2. Restart the Flask app and bots")
+    print("   3. Keep the JSON files as a backup until you've checked the dashboard")
+
+
+if __name__ == "__main__":
+    migrate(sys.argv[1] if len(sys.argv) > 1 else os.getenv('SQLITE_PATH', DEFAULT_SQLITE_PATH))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Read Cache - Parsed state files shared across web requests
+Entries are keyed by path and validated against the file's (mtime, size),
+so an unchanged file is never re-parsed and a changed one is never served
+stale. Least recently used entries are evicted once the cached files add
+up to more than the memory cap.
+
+Cached objects are frozen (see content_registry.freeze); callers that want
+to modify one thaw a copy first.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from content_registry import freeze
+from serializer import read_file
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # by on-disk size of the cached files
+
+
+def file_stamp(path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of path, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReadCache:
+    """LRU cache of frozen, parsed files with a memory cap"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(os.getenv('READ_CACHE_BYTES', max_bytes))
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+        self._bytes = 0
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, default: Any = None) -> Any:
+        """Frozen contents of path, parsing it only if it changed"""
+        key = str(Path(path))
+        stamp = file_stamp(key)
+        self._track(key, stamp)
+        if stamp is None:
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        value = freeze(read_file(key, default))
+        with self._lock:
+            self.misses += 1
+            self._discard(key)
+            if stamp[1] <= self.max_bytes:
+                self._entries[key] = (stamp, value)
+                self._bytes += stamp[1]
+                while self._bytes > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+        return value
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0][1]
+
+    def invalidate(self, path):
+        """Forget path (called after writing it)"""
+        with self._lock:
+            self._discard(str(Path(path)))
+
+    # --- Validators ---------------------------------------------------
+
+    def _track(self, key: str, stamp):
+        stamps = getattr(self._local, 'stamps', None)
+        if stamps is not None:
+            stamps.append((key, stamp))
+
+    def begin(self):
+        """Start recording the files read by this thread (for an ETag)"""
+        self._local.stamps = []
+
+    def end(self, *extra) -> str:
+        """ETag covering the files read since begin() plus any extra parts"""
+        stamps = getattr(self._local, 'stamps', None) or []
+        self._local.stamps = None
+        digest = hashlib.blake2b(repr((sorted(stamps), extra)).encode(), digest_size=12)
+        return digest.hexdigest()
+
+
+# Shared by every request in this process
+READ_CACHE = ReadCache()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Relevance Engine - Compiled context rules for reply targeting
+Builds the context validation rules once and evaluates every rule family
+against a tweet in a single pass over its tokens
+"""
+
+from typing import Dict, List, Optional, Union
+from text_normalizer import NormalizedText, normalize_text, tokenize
+
+# Rule terms are matched on whole words. A trailing '*' matches any word
+# starting with the stem (e.g. 'invest*' matches 'invest', 'investing').
+
+# Context indicators that suggest the tweet is NOT about our topic
+FALSE_POSITIVES = {
+    'land': [
+        'landed', 'landing', 'airport*', 'flight*', 'plane*', 'travel*',
+        'visiting', 'arrived', 'touched down', 'disembarked'
+    ],
+    'property': [
+        'property of', 'belongs to', 'owned by', 'copyright*', 'intellectual property'
+    ],
+    'housing': [
+        'housing estate*', 'housing complex*', 'housing unit*', 'housing project*'
+    ],
+    'investment': [
+        'investment banking', 'investment firm*', 'investment compan*',
+        'investment advisor*', 'investment manager*'
+    ],
+    'betting': [
+        'betting odds', 'betting line*', 'betting spread*', 'betting market*'
+    ]
+}
+
+# Words that rescue a tweet flagged by a false positive
+RELEVANT_WORDS = {
+    'land': ['buy*', 'sell*', 'own*', 'purchas*', 'invest*', 'plot*', 'acre*', 'hectare*', 'propert*', 'real estate'],
+    'property': ['buy*', 'sell*', 'own*', 'purchas*', 'invest*', 'real estate', 'land*', 'house*'],
+    'housing': ['buy*', 'sell*', 'own*', 'purchas*', 'affordable', 'home*', 'house*'],
+    'investment': ['buy*', 'sell*', 'invest*', 'money', 'wealth*', 'passive income', 'return*'],
+    'betting': ['loss*', 'lost', 'waste*', 'regret*', 'addict*', 'stop*', 'quit*']
+}
+
+# Context indicators that suggest the tweet IS about our topic
+POSITIVE_INDICATORS = {
+    'betting': [
+        'lost money', 'betting loss*', 'stop betting', 'gambling', 'waste*',
+        'regret*', 'addict*', 'quit betting', 'lost on', 'lost to'
+    ],
+    'investment': [
+        'how to invest', 'where to invest', 'passive income', 'wealth building',
+        'investment opportunit*', 'invest money', 'make money', 'earn money'
+    ],
+    'land': [
+        'buy land', 'sell land', 'own land', 'land ownership', 'land investment*',
+        'affordable land', 'land for sale', 'real estate', 'property investment*',
+        'land price*', 'land value*', 'plot of land'
+    ],
+    'co_ownership': [
+        'fractional ownership', 'co-ownership', 'shared ownership', 'group purchase*',
+        'syndicat*', 'joint ownership', 'split ownership'
+    ]
+}
+
+# Words that must appear near a Ripple trigger for it to count
+CONTEXT_WORDS = {
+    'nigeria development': ['build*', 'develop*', 'growth', 'progress*', 'nation*', 'country'],
+    'real estate nigeria': ['buy*', 'sell*', 'own*', 'propert*', 'land*', 'house*', 'invest*'],
+    'land': ['buy*', 'sell*', 'own*', 'propert*', 'invest*', 'plot*', 'acre*'],
+    'housing': ['buy*', 'sell*', 'own*', 'affordable', 'home*', 'house*', 'rent*'],
+    'youth': ['young*', 'generation*', 'future', 'opportunit*', 'access*', 'need*'],
+    'inflation': ['price*', 'cost*', 'money', 'econom*', 'nigerian*', 'naira'],
+    'corruption': ['government*', 'politician*', 'leader*', 'accountab*', 'transparen*']
+}
+
+# Words either side of a trigger searched for context (~50 characters)
+CONTEXT_WINDOW = 8
+
+
+class TweetScan:
+    """Rule hits for one tweet, produced by a single pass over its tokens"""
+
+    __slots__ = ('tokens', 'hits')
+
+    def __init__(self, tokens: List[str], hits: Dict[tuple, List[int]]):
+        self.tokens = tokens
+        self.hits = hits  # (family, group) -> token positions
+
+
+class RelevanceEngine:
+    """Compiled context validation rules shared by every bot instance"""
+
+    def __init__(self, false_positives: dict = None, relevant_words: dict = None,
+                 positive_indicators: dict = None, context_words: dict = None,
+                 context_window: int = CONTEXT_WINDOW):
+        self.false_positives = false_positives if false_positives is not None else FALSE_POSITIVES
+        self.relevant_words = relevant_words if relevant_words is not None else RELEVANT_WORDS
+        self.positive_indicators = positive_indicators if positive_indicators is not None else POSITIVE_INDICATORS
+        self.context_words = context_words if context_words is not None else CONTEXT_WORDS
+        self.context_window = context_window
+
+        # first token -> [(remaining tokens, last token is a stem, key)]
+        self._phrases: Dict[str, list] = {}
+        # stem -> [key] for single-word stem terms
+        self._stems: Dict[str, list] = {}
+        self._trigger_lengths: Dict[str, int] = {}
+
+        for family, table in (('fp', self.false_positives),
+                              ('rel', self.relevant_words),
+                              ('pos', self.positive_indicators),
+                              ('ctx', self.context_words)):
+            for group, terms in table.items():
+                for term in terms:
+                    self._compile(term, (family, group))
+
+        for trigger in self.context_words:
+            self._trigger_lengths[trigger] = self._compile(trigger, ('trigger', trigger))
+
+        self._stem_lengths = sorted({len(stem) for stem in self._stems})
+
+    def _compile(self, term: str, key: tuple) -> int:
+        """Add a rule term to the phrase index, returning its length in tokens"""
+        is_stem = term.endswith('*')
+        tokens = tokenize(term.rstrip('*'))
+        if not tokens:
+            return 0
+        if is_stem and len(tokens) == 1:
+            self._stems.setdefault(tokens[0], []).append(key)
+        else:
+            self._phrases.setdefault(tokens[0], []).append((tuple(tokens[1:]), is_stem, key))
+        return len(tokens)
+
+    def scan(self, text: Union[str, NormalizedText]) -> TweetScan:
+        """Evaluate every rule family against a tweet in one pass"""
+        if isinstance(text, str):
+            text = normalize_text(text)
+        tokens = text.tokens
+        hits: Dict[tuple, List[int]] = {}
+        count = len(tokens)
+
+        for i, token in enumerate(tokens):
+            for rest, is_stem, key in self._phrases.get(token, ()):
+                end = i + 1 + len(rest)
+                if end > count:
+                    continue
+                if rest:
+                    if tokens[i + 1:end - 1] != list(rest[:-1]):
+                        continue
+                    last = tokens[end - 1]
+                    if not (last.startswith(rest[-1]) if is_stem else last == rest[-1]):
+                        continue
+                hits.setdefault(key, []).append(i)
+
+            for length in self._stem_lengths:
+                if length > len(token):
+                    break
+                for key in self._stems.get(token[:length], ()):
+                    hits.setdefault(key, []).append(i)
+
+        return TweetScan(tokens, hits)
+
+    def scan_batch(self, texts: List[Union[str, NormalizedText]]) -> List[TweetScan]:
+        """Scan a batch of tweets, reusing results for repeated texts"""
+        seen: Dict[str, TweetScan] = {}
+        scans = []
+        for text in texts:
+            if isinstance(text, str):
+                text = normalize_text(text)
+            scan = seen.get(text.padded)
+            if scan is None:
+                scan = seen[text.padded] = self.scan(text)
+            scans.append(scan)
+        return scans
+
+    def is_relevant(self, scan: TweetScan, category: str, trigger_word: str = "",
+                    require_indicator: bool = False) -> bool:
+        """
+        Check if a scanned tweet is contextually relevant before replying.
+        Returns True only if the tweet is actually about the topic.
+
+        A Ripple trigger_word counts only with context words near it;
+        require_indicator demands a positive indicator (for tweets that
+        matched neither an engagement nor a Ripple trigger).
+        """
+        hits = scan.hits
+
+        # A false positive only counts if no relevant words rescue it
+        if ('fp', category) in hits and category in self.relevant_words:
+            if ('rel', category) not in hits:
+                return False
+
+        if ('pos', category) in hits:
+            return True
+
+        # For Ripple triggers, the trigger word must appear in a relevant context
+        if trigger_word:
+            positions = hits.get(('trigger', trigger_word))
+            if not positions or trigger_word not in self.context_words:
+                return False
+            start = positions[0] - self.context_window
+            end = positions[0] + self._trigger_lengths[trigger_word] - 1 + self.context_window
+            return any(
+                start <= position <= end
+                for position in hits.get(('ctx', trigger_word), ())
+            )
+
+        return not require_indicator
+
+    def evaluate(self, text: Union[str, NormalizedText], category: str,
+                 trigger_word: str = "") -> bool:
+        """Scan and check a single tweet"""
+        return self.is_relevant(self.scan(text), category, trigger_word)
+
+    def classify_batch(self, texts: List[Union[str, NormalizedText]], category: str,
+                       trigger_word: Optional[str] = "") -> List[bool]:
+        """Check a batch of tweets for one category in a single call"""
+        return [
+            self.is_relevant(scan, category, trigger_word or "")
+            for scan in self.scan_batch(texts)
+        ]
+
+
+# Shared engine, compiled once per process
+RELEVANCE_ENGINE = RelevanceEngine()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Relevance Model - Local classifier for reply targeting
+Hashed word and character n-gram features with a NumPy logistic regression,
+trained offline from each user's reply history and hand-added labels
+
+Usage:
+    python3 relevance_model.py train <user_id>
+"""
+
+import json
+import os
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # Optional - bots fall back to the rule engine without it
+    np = None
+
+from state_lock import FileLock
+from text_normalizer import NormalizedText, normalize_text
+from user_paths import user_dir, user_file
+
+N_FEATURES = 2 ** 18
+CHAR_NGRAMS = (3, 4)
+SAMPLES_FILE = 'relevance_samples.jsonl'  # written by the bot
+LABELS_FILE = 'relevance_labels.jsonl'    # added by hand, overrides samples
+MODEL_FILE = 'relevance_model.npz'
+MAX_SAMPLES = 20000  # the sample log is trimmed to the newest half past this
+
+# Per user: (keys of the samples already logged, lines in the log)
+_logged = {}
+_logged_lock = threading.Lock()
+
+# Per-token feature hashes are reused across tweets
+_token_features = {}
+_TOKEN_CACHE_LIMIT = 50000
+
+
+def _hash(feature: str) -> int:
+    """Stable feature hash (Python's hash() is randomized per process)"""
+    return zlib.crc32(feature.encode()) % N_FEATURES
+
+
+def _features_for_token(token: str) -> List[int]:
+    """Word feature plus character n-grams of the word"""
+    features = _token_features.get(token)
+    if features is None:
+        features = [_hash(f'w:{token}')]
+        padded = f'<{token}>'
+        for n in CHAR_NGRAMS:
+            for i in range(len(padded) - n + 1):
+                features.append(_hash(f'c:{padded[i:i + n]}'))
+        if len(_token_features) >= _TOKEN_CACHE_LIMIT:
+            _token_features.clear()
+        _token_features[token] = features
+    return features
+
+
+def extract_features(text: Union[str, NormalizedText], category: str) -> List[int]:
+    """Hashed feature indexes for one tweet"""
+    if isinstance(text, str):
+        text = normalize_text(text)
+    tokens = text.tokens
+    features = [_hash(f'k:{category}')]
+    for token in tokens:
+        features.extend(_features_for_token(token))
+        features.append(_hash(f'x:{category}:{token}'))
+    for first, second in zip(tokens, tokens[1:]):
+        features.append(_hash(f'b:{first} {second}'))
+    return features
+
+
+def _sparse_batch(texts, categories):
+    """Build (rows, cols, values) for a batch; rows are L2-normalized"""
+    rows, cols, counts = [], [], []
+    for row, (text, category) in enumerate(zip(texts, categories)):
+        features = extract_features(text, category)
+        rows.extend([row] * len(features))
+        cols.extend(features)
+        counts.append(len(features))
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    scale = 1.0 / np.sqrt(np.maximum(np.asarray(counts, dtype=np.float64), 1.0))
+    return rows, cols, scale[rows]
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+class RelevanceModel:
+    """Logistic regression over hashed n-gram features"""
+
+    def __init__(self, weights=None, bias: float = 0.0):
+        if np is None:
+            raise ImportError("numpy is required for the relevance model")
+        self.weights = weights if weights is not None else np.zeros(N_FEATURES)
+        self.bias = bias
+
+    def _margins(self, rows, cols, values, count):
+        return np.bincount(rows, weights=self.weights[cols] * values, minlength=count) + self.bias
+
+    def score_batch(self, texts: List[Union[str, NormalizedText]], category: str):
+        """Relevance probability for every tweet in a batch, in one vectorized call"""
+        if not texts:
+            return np.zeros(0)
+        rows, cols, values = _sparse_batch(texts, [category] * len(texts))
+        return _sigmoid(self._margins(rows, cols, values, len(texts)))
+
+    def fit(self, texts: List[str], categories: List[str], labels: List[int],
+            epochs: int = 200, learning_rate: float = 2.0, l2: float = 1e-5):
+        """Train with full-batch gradient descent, balancing the two classes"""
+        count = len(texts)
+        rows, cols, values = _sparse_batch(texts, categories)
+        y = np.asarray(labels, dtype=np.float64)
+        positives = max(y.sum(), 1.0)
+        negatives = max(count - y.sum(), 1.0)
+        sample_weight = np.where(y == 1, count / (2 * positives), count / (2 * negatives))
+
+        for _ in range(epochs):
+            error = (_sigmoid(self._margins(rows, cols, values, count)) - y) * sample_weight
+            gradient = np.bincount(cols, weights=values * error[rows], minlength=N_FEATURES) / count
+            self.weights -= learning_rate * (gradient + l2 * self.weights)
+            self.bias -= learning_rate * error.mean()
+        return self
+
+    def save(self, path: Path):
+        """Save model weights"""
+        np.savez_compressed(path, weights=self.weights, bias=np.array([self.bias]))
+
+    @classmethod
+    def load(cls, path: Path) -> 'RelevanceModel':
+        """Load model weights"""
+        with np.load(path) as data:
+            return cls(weights=data['weights'], bias=float(data['bias'][0]))
+
+
+def _sample_key(sample: dict):
+    """Same tweet (or text, for samples without an ID) and label"""
+    return sample.get('tweet_id') or (sample['text'], sample['category']), sample['label']
+
+
+def _read_samples(path: Path) -> List[dict]:
+    samples = []
+    if path.exists():
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    sample = json.loads(line)
+                except ValueError:
+                    continue
+                if all(field in sample for field in ('text', 'category', 'label')):
+                    samples.append(sample)
+    return samples
+
+
+def _trim_samples(path: Path) -> List[dict]:
+    """Rewrite the log without duplicates, keeping the newest MAX_SAMPLES // 2"""
+    newest = {}
+    for sample in _read_samples(path):
+        key = _sample_key(sample)
+        newest.pop(key, None)
+        newest[key] = sample
+    samples = list(newest.values())[-(MAX_SAMPLES // 2):]
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        f.writelines(json.dumps(sample) + '\n' for sample in samples)
+    os.replace(tmp_path, path)
+    return samples
+
+
+def record_sample(user_id: str, text: str, category: str, label: int, source: str,
+                  tweet_id=None):
+    """
+    Append a training example to the user's sample log, unless that tweet
+    was already logged with the same label (searches return the same
+    recent tweets scan after scan)
+    """
+    samples_file = user_file(user_id, SAMPLES_FILE)
+    sample = {
+        'text': text,
+        'category': category,
+        'label': label,
+        'source': source
+    }
+    if tweet_id is not None:
+        sample['tweet_id'] = str(tweet_id)
+    key = _sample_key(sample)
+    try:
+        with _logged_lock, FileLock(samples_file):
+            logged = _logged.get(user_id)
+            if logged is None:
+                samples = _read_samples(samples_file)
+                logged = _logged[user_id] = [{_sample_key(logged) for logged in samples}, len(samples)]
+            if key in logged[0]:
+                return
+            with open(samples_file, 'a') as f:
+                f.write(json.dumps(sample) + '\n')
+            logged[0].add(key)
+            logged[1] += 1
+            if logged[1] > MAX_SAMPLES:
+                samples = _trim_samples(samples_file)
+                logged[:] = [{_sample_key(kept) for kept in samples}, len(samples)]
+    except OSError as e:
+        print(f"⚠️  Could not record relevance sample for {user_id}: {e}")
+
+
+def load_training_data(user_id: str):
+    """Load reply history samples, with hand-added labels taking precedence"""
+    directory = user_dir(user_id)
+    examples = {}
+    for filename in (SAMPLES_FILE, LABELS_FILE):
+        path = directory / filename
+        if not path.exists():
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    sample = json.loads(line)
+                    key = (normalize_text(sample['text']).padded, sample['category'])
+                    examples[key] = (sample['text'], sample['category'], int(sample['label']))
+                except (ValueError, KeyError) as e:
+                    print(f"⚠️  Skipping bad sample in {path}: {e}")
+    texts, categories, labels = [], [], []
+    for text, category, label in examples.values():
+        texts.append(text)
+        categories.append(category)
+        labels.append(label)
+    return texts, categories, labels
+
+
+def train_user_model(user_id: str) -> Optional[RelevanceModel]:
+    """Train and save a user's relevance model"""
+    texts, categories, labels = load_training_data(user_id)
+    if not texts or len(set(labels)) < 2:
+        print(f"❌ Need both relevant and irrelevant examples to train ({len(texts)} samples)")
+        return None
+
+    model = RelevanceModel().fit(texts, categories, labels)
+    model.save(user_file(user_id, MODEL_FILE))
+
+    # Report training accuracy per category
+    print(f"✅ Trained relevance model for {user_id} on {len(texts)} samples")
+    for category in sorted(set(categories)):
+        indexes = [i for i, c in enumerate(categories) if c == category]
+        predictions = model.score_batch([texts[i] for i in indexes], category) >= 0.5
+        correct = sum(int(predictions[j]) == labels[i] for j, i in enumerate(indexes))
+        print(f"   {category}: {correct}/{len(indexes)} correct")
+    return model
+
+
+def load_user_model(user_id: str) -> Optional[RelevanceModel]:
+    """Load a user's trained model, or None if unavailable"""
+    if np is None:
+        print("⚠️  numpy not installed - using rule engine for relevance")
+        return None
+    model_file = user_file(user_id, MODEL_FILE)
+    if not model_file.exists():
+        print(f"⚠️  No relevance model for {user_id} - using rule engine")
+        return None
+    try:
+        return RelevanceModel.load(model_file)
+    except Exception as e:
+        print(f"❌ Error loading relevance model for {user_id}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == 'train':
+        train_user_model(sys.argv[2])
+    else:
+        print("Usage: python3 relevance_model.py train <user_id>")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Replied Index - Compact store of tweet IDs the bot has replied to
+Keeps the most recent IDs in a bounded int64 ring on disk, with an
+open-addressing hash table over the ring for O(1) membership checks
+"""
+
+import struct
+from array import array
+from pathlib import Path
+
+DEFAULT_CAPACITY = 131072  # at most ~1 MB on disk, ~3 MB in memory
+MIN_TABLE_BITS = 4
+
+_HEADER = struct.Struct('<4sIQQ')  # magic, capacity, next slot, count
+_MAGIC = b'RPLY'
+_EMPTY = 0  # tweet IDs are never 0
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class RepliedIndex:
+    """
+    Ring buffer of replied tweet IDs with a linear-probing hash table.
+    The ring, the table and the file grow with the IDs stored, so a bot
+    that has replied a few times costs a few bytes, not the full capacity.
+    """
+
+    def __init__(self, filepath, capacity: int = DEFAULT_CAPACITY):
+        self.filepath = Path(filepath)
+        self.capacity = capacity
+        self.ring = array('q')  # grows by appending until it holds capacity IDs
+        self.head = 0
+        self.count = 0
+        self.load()
+        self._build_table(self.count)
+
+    def load(self):
+        """Load the ring from file (capacity is taken from the file)"""
+        if not self.filepath.exists():
+            return
+        with open(self.filepath, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            magic, capacity, head, count = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                print(f"⚠️  Ignoring unrecognized replied index {self.filepath}")
+                return
+            ring = array('q')
+            # Files only hold the slots in use (older ones held the whole ring)
+            ring.frombytes(f.read(8 * count))
+        if len(ring) != count or count > capacity or (count < capacity and head != count):
+            print(f"⚠️  Replied index {self.filepath} is truncated, starting fresh")
+            return
+        self.capacity, self.ring, self.head, self.count = capacity, ring, head % capacity, count
+
+    def _build_table(self, entries: int):
+        """(Re)build the hash table, sized to stay at most half full"""
+        self._bits = max(MIN_TABLE_BITS, (2 * entries).bit_length())
+        self._mask = (1 << self._bits) - 1
+        self.table = array('q', bytes(8 << self._bits))
+        for tweet_id in self._ids():
+            self._insert(tweet_id)
+
+    def _ids(self):
+        """Stored IDs, oldest first"""
+        if self.count < self.capacity:
+            yield from self.ring
+            return
+        for offset in range(self.count):
+            yield self.ring[(self.head + offset) % self.capacity]
+
+    def _home(self, tweet_id: int) -> int:
+        return ((tweet_id * _GOLDEN) & _MASK64) >> (64 - self._bits)
+
+    def _find(self, tweet_id: int) -> int:
+        """Table slot holding tweet_id, or the empty slot where it would go"""
+        slot = self._home(tweet_id)
+        table = self.table
+        while table[slot] != _EMPTY and table[slot] != tweet_id:
+            slot = (slot + 1) & self._mask
+        return slot
+
+    def _insert(self, tweet_id: int):
+        self.table[self._find(tweet_id)] = tweet_id
+
+    def _remove(self, tweet_id: int):
+        """Delete with backward shift so probe chains stay unbroken"""
+        table, mask = self.table, self._mask
+        hole = self._find(tweet_id)
+        if table[hole] == _EMPTY:
+            return
+        slot = hole
+        while True:
+            slot = (slot + 1) & mask
+            current = table[slot]
+            if current == _EMPTY:
+                break
+            home = self._home(current)
+            # Leave entries whose home lies cyclically in (hole, slot]
+            if (hole < slot and hole < home <= slot) or (hole > slot and (home > hole or home <= slot)):
+                continue
+            table[hole] = current
+            hole = slot
+        table[hole] = _EMPTY
+
+    def __contains__(self, tweet_id) -> bool:
+        tweet_id = int(tweet_id)
+        return self.table[self._find(tweet_id)] == tweet_id
+
+    def __len__(self):
+        return self.count
+
+    def add(self, tweet_id):
+        """Record a replied tweet, evicting the oldest ID when full"""
+        tweet_id = int(tweet_id)
+        if tweet_id in self:
+            return
+        if self.count == self.capacity:
+            slot = self.head
+            self._remove(self.ring[slot])
+            self.ring[slot] = tweet_id
+        else:
+            slot = self.count
+            self.ring.append(tweet_id)
+            self.count += 1
+            if 2 * self.count > self._mask + 1:
+                self._build_table(2 * self.count)
+        self._insert(tweet_id)
+        self.head = (slot + 1) % self.capacity
+        self._write_slot(slot)
+
+    def _write_slot(self, slot: int):
+        """Persist one ring slot and the header, without rewriting the file"""
+        header = _HEADER.pack(_MAGIC, self.capacity, self.head, self.count)
+        mode = 'r+b' if self.filepath.exists() else 'wb'
+        with open(self.filepath, mode) as f:
+            f.write(header)
+            f.seek(_HEADER.size + 8 * slot)
+            f.write(self.ring[slot:slot + 1].tobytes())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Reply Rotation - Least-recently-used reply template selection
+Walks each template pool in a shuffled order so every template is used
+once per cycle, without scanning a list of recent replies
+"""
+
+import random
+import zlib
+from typing import List
+
+# Pools remembered per bot (least recently used are dropped first)
+MAX_POOLS = 200
+
+
+class ReplyRotation:
+    """
+    Shuffled cursor per reply pool, persisted inside bot data.
+
+    Pools are keyed by their content, so triggers that share the same
+    replies share one rotation, and edited pools start a fresh one.
+    """
+
+    def __init__(self, state: dict):
+        # pool key -> {'order': [template indexes], 'cursor': int}
+        self.state = state
+        self._keys = {}  # id(pool) -> (pool, key)
+
+    def _pool_key(self, replies: List[str]) -> str:
+        """Content key for a pool, computed once per pool object"""
+        cached = self._keys.get(id(replies))
+        if cached is not None and cached[0] is replies:
+            return cached[1]
+        key = f"{len(replies)}:{zlib.crc32(chr(31).join(replies).encode()):08x}"
+        self._keys[id(replies)] = (replies, key)
+        return key
+
+    def next_reply(self, replies: List[str]) -> str:
+        """Return the least recently used reply in the pool"""
+        key = self._pool_key(replies)
+        entry = self.state.pop(key, None)
+
+        if entry is None or entry['cursor'] >= len(entry['order']):
+            order = list(range(len(replies)))
+            random.shuffle(order)
+            # Don't repeat the last reply across a cycle boundary
+            if entry and len(order) > 1 and order[0] == entry['order'][-1]:
+                order[0], order[-1] = order[-1], order[0]
+            entry = {'order': order, 'cursor': 0}
+
+        index = entry['order'][entry['cursor']]
+        entry['cursor'] += 1
+
+        # Re-insert so dict order tracks recency, then drop the stalest pools
+        self.state[key] = entry
+        while len(self.state) > MAX_POOLS:
+            del self.state[next(iter(self.state))]
+
+        return replies[index]
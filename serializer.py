@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Serializer - Codecs for every state file the bot and dashboard write
+pretty  - indented JSON, easy to read and hand-edit (default)
+compact - minified JSON (uses orjson when installed)
+msgpack - binary MessagePack, smallest and fastest (needs msgpack)
+
+Set STATE_CODEC to choose the codec used for writes. Reads detect the
+format from the file contents, so switching codecs needs no migration.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional - stdlib json is used without it
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional - only needed for the msgpack codec
+    msgpack = None
+
+DEFAULT_CODEC = 'pretty'
+
+
+class Codec:
+    """Converts state to and from bytes"""
+
+    name = ''
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class PrettyJsonCodec(Codec):
+    name = 'pretty'
+
+    def dumps(self, obj: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        return json.dumps(obj, indent=2).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class CompactJsonCodec(PrettyJsonCodec):
+    name = 'compact'
+
+    def dumps(self, obj: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj)
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+class MsgpackCodec(Codec):
+    name = 'msgpack'
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack codec (pip install msgpack)")
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+CODECS = {
+    'pretty': PrettyJsonCodec,
+    'compact': CompactJsonCodec,
+    'msgpack': MsgpackCodec
+}
+
+_codecs: Dict[str, Codec] = {}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Codec by name, defaulting to STATE_CODEC"""
+    name = (name or os.getenv('STATE_CODEC') or DEFAULT_CODEC).lower()
+    codec = _codecs.get(name)
+    if codec is None:
+        if name not in CODECS:
+            raise ValueError(f"Unknown codec: {name} (choose from {', '.join(CODECS)})")
+        codec = _codecs[name] = CODECS[name]()
+    return codec
+
+
+def dumps(obj: Any, codec: Optional[str] = None) -> bytes:
+    return get_codec(codec).dumps(obj)
+
+
+def loads(data: bytes) -> Any:
+    """Decode state written by any codec"""
+    stripped = data.lstrip()
+    # JSON documents here are always objects or arrays; MessagePack
+    # maps/arrays never start with these bytes
+    if not stripped or stripped[:1] in (b'{', b'['):
+        return get_codec('pretty').loads(data)
+    return get_codec('msgpack').loads(data)
+
+
+def read_file(path, default: Any = None) -> Any:
+    """Load a state file, or return default if it doesn't exist"""
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+# Read once at import: os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: Path) -> int:
+    """Permissions for a rewritten file: its current ones, or the umask default"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def write_file(path, obj: Any, codec: Optional[str] = None):
+    """Atomically write a state file: temp file in the same directory, then rename"""
+    path = Path(path)
+    data = dumps(obj, codec)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the permissions readers expect
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+State Lock - Cross-process locking and compare-and-swap for state files
+FileLock takes an advisory lock on <file>.lock, so writers in other worker
+processes (and other threads) wait their turn. Read-modify-write updates
+read without the lock, compute the new value, then swap it in under the
+lock only if nothing changed in between, retrying on conflict.
+
+Lock files are never removed: deleting one while another process waits
+on it would let a third process lock a new file and both proceed. They
+are empty and can be deleted while nothing is running.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows - locks only hold within this process
+    fcntl = None
+
+MAX_RETRIES = 10
+RETRY_DELAY = 0.01  # seconds, doubled after each conflict
+
+_local_locks = {}
+_local_locks_lock = threading.Lock()
+
+
+class VersionConflict(Exception):
+    """Stored state changed since it was read"""
+
+
+class FileLock:
+    """
+    Advisory lock on path (held via a .lock file beside it). Shared locks
+    only exclude exclusive ones.
+    """
+
+    def __init__(self, path, shared: bool = False):
+        path = Path(path)
+        self.lock_path = path.with_name(path.name + '.lock')
+        self.shared = shared
+        self._fd = None
+        self._local = None
+
+    def __enter__(self):
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            # No shared mode here: every holder is exclusive
+            with _local_locks_lock:
+                self._local = _local_locks.setdefault(str(self.lock_path.resolve()), threading.Lock())
+            self._local.acquire()
+            return self
+        # flock is per open file, so threads of one process exclude each other too
+        self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        if self._local is not None:
+            self._local.release()
+            self._local = None
+
+
+def retry_on_conflict(attempt):
+    """
+    Call attempt() until it doesn't raise VersionConflict.
+    Gives up (re-raising) after MAX_RETRIES conflicts.
+    """
+    delay = RETRY_DELAY
+    for retry in range(MAX_RETRIES):
+        try:
+            return attempt()
+        except VersionConflict:
+            if retry == MAX_RETRIES - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Stats Series - Tiered retention for bot statistics
+Counters are kept per hour for recent days, per day for recent months and
+per month beyond that, so stored history stays bounded however long a bot
+has been running. Lifetime totals live separately in bot data.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+HOURLY_DAYS = 7      # 'YYYY-MM-DD HH' buckets
+DAILY_DAYS = 90      # 'YYYY-MM-DD' buckets (bot data's daily_stats)
+MONTHLY_MONTHS = 36  # 'YYYY-MM' buckets
+
+
+def _add(bucket: dict, stats: dict):
+    for name, value in stats.items():
+        if isinstance(value, (int, float)):
+            bucket[name] = bucket.get(name, 0) + value
+
+
+class StatsSeries:
+    """Hourly, daily and monthly stat buckets stored inside a bot data dict"""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.daily = data.setdefault('daily_stats', {})
+        self.hourly = data.setdefault('hourly_stats', {})
+        self.monthly = data.setdefault('monthly_stats', {})
+
+    def increment(self, stat_name: str, day: str, hour: Optional[int] = None, amount: int = 1):
+        """Count a stat in every tier that covers the given day/hour"""
+        if day not in self.daily:
+            self.daily[day] = {}
+            self.compact(datetime.strptime(day, '%Y-%m-%d').date())
+        self.daily[day][stat_name] = self.daily[day].get(stat_name, 0) + amount
+
+        if hour is not None:
+            bucket = self.hourly.setdefault(f"{day} {hour:02d}", {})
+            bucket[stat_name] = bucket.get(stat_name, 0) + amount
+
+    def compact(self, today: Optional[date] = None):
+        """Downsample buckets that have aged out of their tier"""
+        today = today or date.today()
+
+        hourly_cutoff = (today - timedelta(days=HOURLY_DAYS - 1)).strftime('%Y-%m-%d')
+        for key in [key for key in self.hourly if key[:10] < hourly_cutoff]:
+            # Already counted in the daily tier
+            del self.hourly[key]
+
+        daily_cutoff = (today - timedelta(days=DAILY_DAYS - 1)).strftime('%Y-%m-%d')
+        for day in [day for day in self.daily if day < daily_cutoff]:
+            _add(self.monthly.setdefault(day[:7], {}), self.daily.pop(day))
+
+        months = sorted(self.monthly)
+        for month in months[:max(0, len(months) - MONTHLY_MONTHS)]:
+            del self.monthly[month]
+
+    def day(self, day: str) -> dict:
+        return self.daily.get(day, {})
+
+    def range(self, start: date, end: date) -> Dict[str, dict]:
+        """
+        Totals for each bucket overlapping [start, end], oldest first.
+        Days still in the daily tier are reported per day; older periods
+        per month.
+        """
+        result = {}
+        first, last = start.strftime('%Y-%m'), end.strftime('%Y-%m')
+        for month in sorted(self.monthly):
+            if first <= month <= last:
+                result[month] = dict(self.monthly[month])
+        first, last = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        for day in sorted(self.daily):
+            if first <= day <= last:
+                result[day] = dict(self.daily[day])
+        return result
+
+    def totals(self, start: date, end: date) -> dict:
+        """Summed stats over [start, end] at the finest resolution kept"""
+        totals = {}
+        for stats in self.range(start, end).values():
+            _add(totals, stats)
+        return totals
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Storage - Pluggable backends for user accounts and per-user bot state
+JsonStorage keeps the original file layout; SqliteStorage keeps the same
+data in one SQLite database (WAL mode) with tables following
+dataconnect/schema/schema.gql
+
+Select the backend with STORAGE_BACKEND=json|sqlite (SQLITE_PATH sets the
+database file). Use migrate_to_sqlite.py to move existing JSON data over.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from content_registry import thaw
+from read_cache import READ_CACHE, ReadCache, file_stamp
+from serializer import read_file, write_file
+from state_lock import FileLock, VersionConflict, retry_on_conflict
+from user_paths import USERS_DIR, user_file
+
+DEFAULT_SQLITE_PATH = 'subx.db'
+
+# expected_version meaning "the user must not exist yet"
+NO_RECORD = -1
+
+
+def _record_version(user: Optional[dict]) -> int:
+    return NO_RECORD if user is None else user.get('version', 0)
+
+
+class Storage:
+    """Interface implemented by every storage backend"""
+
+    # Users
+    def load_users(self) -> Dict[str, dict]:
+        raise NotImplementedError
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def put_user(self, user_id: str, user: dict, expected_version: Optional[int] = None):
+        """
+        Save a user. With expected_version, raise VersionConflict unless the
+        stored user's 'version' still equals it (NO_RECORD: not stored yet).
+        """
+        raise NotImplementedError
+
+    def put_users(self, users: Dict[str, dict], expected_versions: Optional[Dict[str, int]] = None):
+        """
+        Save many users as one batch. Every expected version is checked
+        before anything is written; any mismatch raises VersionConflict.
+        Only SqliteStorage also survives a crash mid-batch all or nothing.
+        """
+        raise NotImplementedError
+
+    def users_version(self) -> Any:
+        """Value that changes whenever any user is written (None if unknown)"""
+        return None
+
+    def users_changed_since(self, version: Any) -> Optional[Set[str]]:
+        """
+        IDs of the users written since users_version() returned version
+        (possibly a few more), or None if unknown: reload everyone.
+        """
+        return None
+
+    def state_version(self, user_id: str) -> Any:
+        """
+        Value that changes whenever the user's bot data, scheduled tweets or
+        documents (or the shared default documents) change. None if unknown.
+        """
+        return None
+
+    # Bot data (counters, rotation state, ...)
+    def load_bot_data(self, user_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def save_bot_data(self, user_id: str, data: dict):
+        raise NotImplementedError
+
+    # Scheduled tweets
+    def load_scheduled_tweets(self, user_id: str) -> List[dict]:
+        raise NotImplementedError
+
+    def save_scheduled_tweets(self, user_id: str, tweets: List[dict]):
+        raise NotImplementedError
+
+    def update_scheduled_tweets(self, user_id: str, change) -> List[dict]:
+        """
+        Read-modify-write: change(tweets) edits the list in place. Saved only
+        if nobody else changed the list meanwhile, otherwise retried.
+        """
+        raise NotImplementedError
+
+    # Documents: tweet_queue, reply_templates (user_id None = shared default)
+    def load_document(self, user_id: Optional[str], name: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def save_document(self, user_id: Optional[str], name: str, value: Any):
+        raise NotImplementedError
+
+    def update_document(self, user_id: Optional[str], name: str, change, default: Any = None) -> Any:
+        """Read-modify-write a document (starting from default if missing), as above"""
+        raise NotImplementedError
+
+    def cached(self, cache: ReadCache = READ_CACHE) -> 'Storage':
+        """
+        View of this storage whose loads are served from cache as frozen
+        objects. Backends without files to validate against return self.
+        """
+        return self
+
+
+# Documents a user's pages are rendered from
+STATE_DOCUMENTS = ('tweet_queue', 'reply_templates')
+
+# Record fields copied into the users.json index
+USER_INDEX_FIELDS = ('username', 'email', 'twitter_id')
+
+# The user change journal is started afresh (everyone reloads once) past this
+MAX_JOURNAL_BYTES = 1024 * 1024
+
+class JsonStorage(Storage):
+    """
+    One directory per user (see user_paths): user.json plus the user's state
+    files. users.json is a small index (user_id -> username, email,
+    twitter_id), rewritten only when a user is added or one of those
+    fields changes, so saving a user costs the same however many exist.
+    Every save also appends the user ID to users/.users_journal, so other
+    processes re-read just the users that changed.
+
+    Writers that must not lose each other's updates hold an advisory
+    FileLock on the file they change, so this is safe across processes.
+    """
+
+    def __init__(self, users_file: str = 'users.json', users_dir: str = USERS_DIR,
+                 cache: Optional[ReadCache] = None):
+        self.users_file = Path(users_file)
+        self.users_dir = Path(users_dir)
+        self.cache = cache
+        self.journal_file = self.users_dir / '.users_journal'
+        if cache is None:
+            self._split_legacy_users()
+
+    def cached(self, cache: ReadCache = READ_CACHE) -> 'JsonStorage':
+        return JsonStorage(self.users_file, self.users_dir, cache=cache)
+
+    def _read(self, path: Path, default: Any = None) -> Any:
+        if self.cache is not None:
+            return self.cache.get(path, default)
+        return read_file(path, default)
+
+    def _write(self, path: Path, value: Any):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_file(path, value)
+        READ_CACHE.invalidate(path)
+
+    def _user_file(self, user_id: str, filename: str) -> Path:
+        return user_file(user_id, filename, self.users_dir)
+
+    def _load_index(self) -> Dict[str, dict]:
+        return READ_CACHE.get(self.users_file, {})
+
+    def _split_legacy_users(self):
+        """Convert the old one-file-for-everything users.json (once, on startup)"""
+        index = READ_CACHE.get(self.users_file, {})
+        # Legacy files hold full records, which always carry user_id
+        if not any('user_id' in entry for entry in index.values()):
+            return
+        with FileLock(self.users_file):
+            users = read_file(self.users_file, {})
+            if any('user_id' in entry for entry in users.values()):
+                print(f"🔄 Splitting {self.users_file} into per-user files...")
+                for user_id, user in users.items():
+                    if 'user_id' in user and not self._user_file(user_id, 'user.json').exists():
+                        self._write(self._user_file(user_id, 'user.json'), user)
+                self._write(self.users_file, {
+                    user_id: {field: user.get(field) for field in USER_INDEX_FIELDS}
+                    for user_id, user in users.items()
+                })
+                self._start_journal()
+
+    def load_users(self) -> Dict[str, dict]:
+        users = {}
+        for user_id in self._load_index():
+            user = self.get_user(user_id)
+            if user is not None:
+                users[user_id] = user
+        return users
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self._read(self._user_file(user_id, 'user.json'))
+
+    def put_user(self, user_id: str, user: dict, expected_version: Optional[int] = None):
+        path = self._user_file(user_id, 'user.json')
+        # Shared hold on the index keeps batches (put_users) out meanwhile
+        with FileLock(self.users_file, shared=True), FileLock(path):
+            if expected_version is not None and _record_version(read_file(path)) != expected_version:
+                raise VersionConflict(f"user {user_id}")
+            self._write(path, user)
+        entry = {field: user.get(field) for field in USER_INDEX_FIELDS}
+        if self._load_index().get(user_id) != entry:
+            with FileLock(self.users_file):
+                index = read_file(self.users_file, {})
+                index[user_id] = entry
+                self._write(self.users_file, index)
+        self._journal([user_id])
+
+    def put_users(self, users: Dict[str, dict], expected_versions: Optional[Dict[str, int]] = None):
+        # Records are written one file at a time: a crash partway leaves the
+        # earlier ones saved (each file itself is written atomically)
+        # Exclusive hold on the index shuts out single-user writers for the batch
+        with FileLock(self.users_file):
+            for user_id, expected in (expected_versions or {}).items():
+                if _record_version(read_file(self._user_file(user_id, 'user.json'))) != expected:
+                    raise VersionConflict(f"user {user_id}")
+            for user_id, user in users.items():
+                self._write(self._user_file(user_id, 'user.json'), user)
+
+            index = read_file(self.users_file, {})
+            entries = {user_id: {field: user.get(field) for field in USER_INDEX_FIELDS}
+                       for user_id, user in users.items()}
+            if any(index.get(user_id) != entry for user_id, entry in entries.items()):
+                index.update(entries)
+                self._write(self.users_file, index)
+            self._journal(users)
+
+    def _journal(self, user_ids):
+        """Record that user_ids were written (after writing them)"""
+        lines = ''.join(f'{user_id}\n' for user_id in user_ids).encode()
+        self.users_dir.mkdir(parents=True, exist_ok=True)
+        # O_APPEND: concurrent appends from other processes don't interleave
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, lines)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > MAX_JOURNAL_BYTES:
+            self._start_journal()
+
+    def _start_journal(self):
+        """Replace the journal with an empty one: every reader reloads once"""
+        self.users_dir.mkdir(parents=True, exist_ok=True)
+        fresh = self.journal_file.with_name(f'{self.journal_file.name}.{os.getpid()}.tmp')
+        fresh.write_bytes(b'')
+        os.replace(fresh, self.journal_file)
+
+    def users_version(self) -> Any:
+        """(journal inode, journal size)"""
+        try:
+            stat = os.stat(self.journal_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def users_changed_since(self, version: Any) -> Optional[Set[str]]:
+        current = self.users_version()
+        if version is None or current is None or current[0] != version[0] or current[1] < version[1]:
+            return None
+        try:
+            with open(self.journal_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_ino != version[0]:
+                    return None  # started afresh meanwhile
+                f.seek(version[1])
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # A trailing partial line is picked up again next time
+        return set(data[:data.rfind(b'\n') + 1].decode().splitlines())
+
+    def state_version(self, user_id: str) -> Any:
+        return tuple(
+            file_stamp(path) for path in (
+                self._user_file(user_id, 'bot_data.json'),
+                self._user_file(user_id, 'scheduled_tweets.json'),
+                *(self._document_file(owner, name)
+                  for owner in (user_id, None) for name in STATE_DOCUMENTS)
+            )
+        )
+
+    def load_bot_data(self, user_id: str) -> Optional[dict]:
+        return self._read(self._user_file(user_id, 'bot_data.json'))
+
+    def save_bot_data(self, user_id: str, data: dict):
+        self._write(self._user_file(user_id, 'bot_data.json'), data)
+
+    def load_scheduled_tweets(self, user_id: str) -> List[dict]:
+        return self._read(self._user_file(user_id, 'scheduled_tweets.json'), [])
+
+    def save_scheduled_tweets(self, user_id: str, tweets: List[dict]):
+        self._write(self._user_file(user_id, 'scheduled_tweets.json'), tweets)
+
+    def update_scheduled_tweets(self, user_id: str, change) -> List[dict]:
+        return self._update_file(self._user_file(user_id, 'scheduled_tweets.json'), change, [])
+
+    def _update_file(self, path: Path, change, default: Any) -> Any:
+        """Compare-and-swap on the file's contents"""
+        def attempt():
+            current = read_file(path)
+            value = thaw(current if current is not None else default)
+            change(value)
+            with FileLock(path):
+                if read_file(path) != current:
+                    raise VersionConflict(str(path))
+                self._write(path, value)
+            return value
+
+        return retry_on_conflict(attempt)
+
+    def _document_file(self, user_id: Optional[str], name: str) -> Path:
+        if user_id is None:
+            return Path(f'{name}.json')
+        return self._user_file(user_id, f'{name}.json')
+
+    def load_document(self, user_id: Optional[str], name: str) -> Optional[Any]:
+        return self._read(self._document_file(user_id, name))
+
+    def save_document(self, user_id: Optional[str], name: str, value: Any):
+        self._write(self._document_file(user_id, name), value)
+
+    def update_document(self, user_id: Optional[str], name: str, change, default: Any = None) -> Any:
+        return self._update_file(self._document_file(user_id, name), change, default)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id     TEXT PRIMARY KEY,
+    username    TEXT NOT NULL,
+    email       TEXT,
+    created_at  TEXT NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS twitter_accounts (
+    user_id            TEXT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+    twitter_user_id    TEXT NOT NULL UNIQUE,
+    twitter_username   TEXT,
+    created_at         TEXT NOT NULL,
+    PRIMARY KEY (user_id, twitter_user_id)
+);
+
+CREATE TABLE IF NOT EXISTS scheduled_tweets (
+    id                 INTEGER PRIMARY KEY,
+    user_id            TEXT NOT NULL,
+    position           INTEGER NOT NULL,
+    tweet_text         TEXT NOT NULL,
+    scheduled_time     TEXT NOT NULL,
+    status             TEXT NOT NULL,
+    created_at         TEXT,
+    reply_to_tweet_id  TEXT,
+    data               TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_user_status
+    ON scheduled_tweets (user_id, status, scheduled_time);
+
+CREATE TABLE IF NOT EXISTS bot_data (
+    user_id     TEXT PRIMARY KEY,
+    data        TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    user_id     TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (user_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('users_version', 0);
+CREATE TRIGGER IF NOT EXISTS users_version_insert AFTER INSERT ON users
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'users_version'; END;
+CREATE TRIGGER IF NOT EXISTS users_version_update AFTER UPDATE ON users
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'users_version'; END;
+CREATE TRIGGER IF NOT EXISTS users_version_delete AFTER DELETE ON users
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'users_version'; END;
+
+-- Bumped on every write to a user's bot state ('' = shared documents)
+CREATE TABLE IF NOT EXISTS state_versions (
+    user_id  TEXT PRIMARY KEY,
+    version  INTEGER NOT NULL
+);
+"""
+
+
+STATE_TABLES = ('bot_data', 'scheduled_tweets', 'documents')
+STATE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_state_{event} AFTER {event} ON {table}
+    BEGIN INSERT INTO state_versions (user_id, version) VALUES ({row}.user_id, 1)
+          ON CONFLICT (user_id) DO UPDATE SET version = version + 1; END;
+"""
+SCHEMA += ''.join(
+    STATE_TRIGGER.format(table=table, event=event, row='OLD' if event == 'DELETE' else 'NEW')
+    for table in STATE_TABLES for event in ('INSERT', 'UPDATE', 'DELETE')
+)
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class SqliteStorage(Storage):
+    """
+    Single SQLite database in WAL mode: readers don't block the writer.
+
+    Rows keep the full JSON record in `data`; the columns pulled out of it
+    exist for indexed lookups. Credentials stay encrypted in credentials.enc.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    def load_users(self) -> Dict[str, dict]:
+        rows = self._connect().execute('SELECT user_id, data FROM users').fetchall()
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        row = self._connect().execute(
+            'SELECT data FROM users WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _check_version(self, conn: sqlite3.Connection, user_id: str, expected_version: int):
+        row = conn.execute('SELECT data FROM users WHERE user_id = ?', (user_id,)).fetchone()
+        if _record_version(json.loads(row[0]) if row else None) != expected_version:
+            raise VersionConflict(f"user {user_id}")
+
+    def _put_user(self, conn: sqlite3.Connection, user_id: str, user: dict):
+        conn.execute(
+            'INSERT INTO users (user_id, username, email, created_at, data) '
+            'VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (user_id) DO UPDATE SET username = excluded.username, '
+            'email = excluded.email, data = excluded.data',
+            (user_id, user.get('username') or '', user.get('email'),
+             user.get('created_at') or _now(), json.dumps(user))
+        )
+        conn.execute('DELETE FROM twitter_accounts WHERE user_id = ?', (user_id,))
+        if user.get('twitter_id'):
+            conn.execute(
+                'INSERT OR REPLACE INTO twitter_accounts '
+                '(user_id, twitter_user_id, twitter_username, created_at) VALUES (?, ?, ?, ?)',
+                (user_id, str(user['twitter_id']), user.get('username'),
+                 user.get('created_at') or _now())
+            )
+
+    def put_user(self, user_id: str, user: dict, expected_version: Optional[int] = None):
+        conn = self._connect()
+        with conn:
+            if expected_version is not None:
+                # Take the write lock before checking so the check still holds when we write
+                conn.execute('BEGIN IMMEDIATE')
+                self._check_version(conn, user_id, expected_version)
+            self._put_user(conn, user_id, user)
+
+    def put_users(self, users: Dict[str, dict], expected_versions: Optional[Dict[str, int]] = None):
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            for user_id, expected in (expected_versions or {}).items():
+                self._check_version(conn, user_id, expected)
+            for user_id, user in users.items():
+                self._put_user(conn, user_id, user)
+
+    def users_version(self) -> Any:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'users_version'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def state_version(self, user_id: str) -> Any:
+        rows = self._connect().execute(
+            "SELECT user_id, version FROM state_versions WHERE user_id IN (?, '')", (user_id,)
+        ).fetchall()
+        versions = dict(rows)
+        return versions.get(user_id, 0), versions.get('', 0)
+
+    def load_bot_data(self, user_id: str) -> Optional[dict]:
+        row = self._connect().execute(
+            'SELECT data FROM bot_data WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_bot_data(self, user_id: str, data: dict):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO bot_data (user_id, data, updated_at) VALUES (?, ?, ?)',
+                (user_id, json.dumps(data), _now())
+            )
+
+    def _load_scheduled(self, conn: sqlite3.Connection, user_id: str) -> List[dict]:
+        rows = conn.execute(
+            'SELECT data FROM scheduled_tweets WHERE user_id = ? ORDER BY position',
+            (user_id,)
+        ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def _save_scheduled(self, conn: sqlite3.Connection, user_id: str, tweets: List[dict]):
+        conn.execute('DELETE FROM scheduled_tweets WHERE user_id = ?', (user_id,))
+        conn.executemany(
+            'INSERT INTO scheduled_tweets (user_id, position, tweet_text, scheduled_time, '
+            'status, created_at, reply_to_tweet_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (user_id, position, tweet.get('tweet', ''), tweet.get('datetime', ''),
+                 tweet.get('status', 'pending'), tweet.get('created_at'),
+                 tweet.get('reply_to_tweet_id'), json.dumps(tweet))
+                for position, tweet in enumerate(tweets)
+            ]
+        )
+
+    def load_scheduled_tweets(self, user_id: str) -> List[dict]:
+        return self._load_scheduled(self._connect(), user_id)
+
+    def save_scheduled_tweets(self, user_id: str, tweets: List[dict]):
+        with self._connect() as conn:
+            self._save_scheduled(conn, user_id, tweets)
+
+    def update_scheduled_tweets(self, user_id: str, change) -> List[dict]:
+        return self._compare_and_swap(
+            lambda conn: self._load_scheduled(conn, user_id),
+            lambda conn, tweets: self._save_scheduled(conn, user_id, tweets),
+            change, []
+        )
+
+    def _load_document(self, conn: sqlite3.Connection, user_id: Optional[str], name: str) -> Optional[Any]:
+        row = conn.execute(
+            'SELECT data FROM documents WHERE user_id = ? AND name = ?',
+            (user_id or '', name)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save_document(self, conn: sqlite3.Connection, user_id: Optional[str], name: str, value: Any):
+        conn.execute(
+            'INSERT OR REPLACE INTO documents (user_id, name, data, updated_at) VALUES (?, ?, ?, ?)',
+            (user_id or '', name, json.dumps(value), _now())
+        )
+
+    def load_document(self, user_id: Optional[str], name: str) -> Optional[Any]:
+        return self._load_document(self._connect(), user_id, name)
+
+    def save_document(self, user_id: Optional[str], name: str, value: Any):
+        with self._connect() as conn:
+            self._save_document(conn, user_id, name, value)
+
+    def update_document(self, user_id: Optional[str], name: str, change, default: Any = None) -> Any:
+        return self._compare_and_swap(
+            lambda conn: self._load_document(conn, user_id, name),
+            lambda conn, value: self._save_document(conn, user_id, name, value),
+            change, default
+        )
+
+    def _compare_and_swap(self, load, save, change, default: Any) -> Any:
+        """Change outside any transaction; re-check and write inside one"""
+        def attempt():
+            current = load(self._connect())
+            value = thaw(current if current is not None else default)
+            change(value)
+            conn = self._connect()
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                if load(conn) != current:
+                    raise VersionConflict('stored value changed')
+                save(conn, value)
+            return value
+
+        return retry_on_conflict(attempt)
+
+
+_storage: Optional[Storage] = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    """Process-wide storage backend chosen by STORAGE_BACKEND"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = os.getenv('STORAGE_BACKEND', 'json').lower()
+            if backend == 'sqlite':
+                _storage = SqliteStorage(os.getenv('SQLITE_PATH', DEFAULT_SQLITE_PATH))
+            elif backend == 'json':
+                _storage = JsonStorage()
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+        return _storage
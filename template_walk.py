@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Template Walk - Repeat-free tweet generation
+Visits every combination of each tweet_generator category exactly once,
+in a per-user keyed pseudo-random order, before starting a new cycle
+"""
+
+import random
+import zlib
+from typing import Callable, Optional, Tuple
+
+from tweet_generator import CATEGORY_BUILDERS, category_size, render_tweet
+
+FEISTEL_ROUNDS = 4
+MAX_ATTEMPTS = 5  # combinations tried per post before giving up
+
+
+def _feistel(value: int, half_bits: int, key: str) -> int:
+    """Keyed bijection on [0, 2 ** (2 * half_bits))"""
+    mask = (1 << half_bits) - 1
+    left, right = value >> half_bits, value & mask
+    for round_number in range(FEISTEL_ROUNDS):
+        mixed = zlib.crc32(f"{key}:{round_number}:{right}".encode()) & mask
+        left, right = right, left ^ mixed
+    return (left << half_bits) | right
+
+
+def permute(index: int, size: int, key: str) -> int:
+    """Map index to its position in a keyed permutation of range(size)"""
+    if size <= 0:
+        raise ValueError(f"Cannot permute an empty range (size {size})")
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    # Cycle-walk until the Feistel output falls inside the domain
+    value = _feistel(index, half_bits, key)
+    while value >= size:
+        value = _feistel(value, half_bits, key)
+    return value
+
+
+class TemplateWalk:
+    """
+    Per-user walk over the generator's template space, persisted inside bot data.
+
+    State per category is a position and cycle number; each cycle uses a
+    fresh permutation, so no combination repeats until all have been posted.
+    """
+
+    def __init__(self, state: dict):
+        self.state = state
+        if 'seed' not in self.state:
+            self.state['seed'] = f"{random.getrandbits(64):016x}"
+        self.state.setdefault('categories', {})
+
+    def _category_state(self, category: str) -> dict:
+        size = category_size(category)
+        entry = self.state['categories'].get(category)
+        # Edited templates change the space, so the walk starts over
+        if entry is None or entry['size'] != size:
+            entry = {'size': size, 'position': 0, 'cycle': 0}
+            self.state['categories'][category] = entry
+        return entry
+
+    def next_tweet(self, category: Optional[str] = None) -> Tuple[str, str]:
+        """Return (category, tweet) for the next unused combination"""
+        if category is None:
+            category = random.choice(list(CATEGORY_BUILDERS))
+        entry = self._category_state(category)
+
+        if entry['position'] >= entry['size']:
+            entry['position'] = 0
+            entry['cycle'] += 1
+
+        key = f"{self.state['seed']}:{category}:{entry['cycle']}"
+        index = permute(entry['position'], entry['size'], key)
+        entry['position'] += 1
+        return category, render_tweet(category, index)
+
+    def next_unique_tweet(self, is_duplicate: Callable[[str], bool],
+                          category: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        next_tweet, skipping combinations is_duplicate rejects (e.g. too
+        close to something already posted). None after MAX_ATTEMPTS tries.
+        """
+        for _ in range(MAX_ATTEMPTS):
+            result = self.next_tweet(category)
+            if not is_duplicate(result[1]):
+                return result
+        return None
+
+    def coverage(self) -> dict:
+        """Used/total combinations per category"""
+        stats = {}
+        for category in CATEGORY_BUILDERS:
+            entry = self._category_state(category)
+            stats[category] = {
+                'used': entry['position'],
+                'total': entry['size'],
+                'cycle': entry['cycle'],
+                'percent': round(100 * entry['position'] / entry['size'], 1) if entry['size'] else 0.0
+            }
+        return stats
@@ -0,0 +1,56 @@
+import multiprocessing
+
+import pytest
+
+from storage import JsonStorage, SqliteStorage
+from user_manager import UserManager
+
+WORKERS = 4
+UPDATES = 15
+
+fork = pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+
+
+def open_storage(backend, tmp_path):
+    if backend == 'json':
+        return JsonStorage(users_file=tmp_path / 'users.json', users_dir=tmp_path / 'users')
+    return SqliteStorage(tmp_path / 'subx.db')
+
+
+def append_keywords(backend, tmp_path, worker):
+    # Each process opens its own storage, like a separate web/bot worker
+    manager = UserManager(storage=open_storage(backend, tmp_path))
+    for update in range(UPDATES):
+        manager.modify_user_config(
+            'u1', lambda config: config['keywords']['land'].append(f'w{worker}-{update}')
+        )
+
+
+@fork
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_concurrent_config_appends_are_not_lost(backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = UserManager(storage=open_storage(backend, tmp_path))
+    manager.create_user('u1', '@u1')
+    before = list(manager.get_user_config('u1')['keywords']['land'])
+
+    context = multiprocessing.get_context('fork')
+    workers = [
+        context.Process(target=append_keywords, args=(backend, tmp_path, worker))
+        for worker in range(WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    fresh = UserManager(storage=open_storage(backend, tmp_path))
+    land = fresh.get_user_config('u1')['keywords']['land']
+    added = land[len(before):]
+    assert sorted(added) == sorted(
+        f'w{worker}-{update}' for worker in range(WORKERS) for update in range(UPDATES)
+    )
+    assert fresh.get_user('u1')['version'] == 1 + WORKERS * UPDATES
@@ -0,0 +1,52 @@
+from config_layers import (DEFAULT_BOT_CONFIG, PRESETS, base_config, config_delta,
+                           merge_config)
+from content_registry import thaw
+from storage import JsonStorage
+from user_manager import UserManager
+
+
+def test_delta_marks_removed_keys_with_none():
+    base = {'tweets_per_day': 6, 'keywords': {'land': ['a'], 'betting': ['b']}}
+    config = {'tweets_per_day': 6, 'keywords': {'land': ['a', 'c']}}
+
+    delta = config_delta(config, base)
+    assert delta == {'keywords': {'land': ['a', 'c'], 'betting': None}}
+    assert merge_config(base, delta) == config
+
+
+def test_none_override_removes_a_key():
+    merged = merge_config(DEFAULT_BOT_CONFIG, PRESETS['real_estate'])
+    assert 'betting' not in merged['keywords']
+    assert merged['keywords']['land'] == DEFAULT_BOT_CONFIG['keywords']['land']
+
+
+def test_user_config_layers_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = UserManager(storage=JsonStorage(users_file=tmp_path / 'users.json',
+                                              users_dir=tmp_path / 'users'))
+    manager.create_user('u1', '@u1', preset='conservative')
+
+    config = manager.get_user_config('u1')
+    assert thaw(config) == base_config('conservative')
+    assert manager.get_user_config('u1') is config  # memoized until the user changes
+
+    def customize(current):
+        current['max_replies_per_hour'] = 4
+        del current['keywords']['betting']
+    manager.modify_user_config('u1', customize)
+
+    stored = manager.get_user('u1')['bot_config']
+    assert thaw(stored) == {'max_replies_per_hour': 4, 'keywords': {'betting': None}}
+    config = manager.get_user_config('u1')
+    assert config['max_replies_per_hour'] == 4
+    assert config['tweets_per_day'] == PRESETS['conservative']['tweets_per_day']
+    assert 'betting' not in config['keywords']
+
+    # Overrides survive a preset switch and a fresh process
+    manager.set_config_preset('u1', 'growth')
+    reloaded = UserManager(storage=JsonStorage(users_file=tmp_path / 'users.json',
+                                               users_dir=tmp_path / 'users'))
+    config = reloaded.get_user_config('u1')
+    assert config['tweets_per_day'] == PRESETS['growth']['tweets_per_day']
+    assert config['max_replies_per_hour'] == 4
+    assert 'betting' not in config['keywords']
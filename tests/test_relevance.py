@@ -0,0 +1,22 @@
+from relevance import RELEVANCE_ENGINE
+
+
+def relevant(text, category, trigger_word='', **kwargs):
+    return RELEVANCE_ENGINE.is_relevant(RELEVANCE_ENGINE.scan(text), category, trigger_word, **kwargs)
+
+
+def test_plain_matches_need_a_positive_indicator():
+    assert not relevant('We landed at the airport', 'betting', require_indicator=True)
+    assert relevant('I lost money betting again', 'betting', require_indicator=True)
+
+
+def test_false_positive_without_rescue_words_is_rejected():
+    assert not relevant('Just landed at the airport, land of sunshine', 'land')
+    assert relevant('Landed in Lagos to buy a plot of land', 'land')
+
+
+def test_ripple_trigger_needs_context_nearby():
+    assert relevant('Youth unemployment keeps rising, our generation needs access', 'land', 'youth')
+    assert not relevant('The youth choir sang beautifully today', 'land', 'youth')
+    # Triggers without context rules are too ambiguous on their own
+    assert not relevant('This is about something else entirely', 'land', 'no such trigger')
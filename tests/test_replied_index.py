@@ -0,0 +1,55 @@
+import random
+from collections import deque
+
+from replied_index import RepliedIndex
+
+
+def test_small_index_stays_small(tmp_path):
+    path = tmp_path / 'replied_tweets.bin'
+    index = RepliedIndex(path)
+    for tweet_id in (101, 202, 303):
+        index.add(tweet_id)
+
+    assert path.stat().st_size < 100
+    assert len(index.table) <= 64
+    assert 202 in index and 404 not in index
+
+
+def test_eviction_keeps_the_newest_ids(tmp_path):
+    index = RepliedIndex(tmp_path / 'replied_tweets.bin', capacity=8)
+    for tweet_id in range(1, 21):
+        index.add(tweet_id)
+
+    assert len(index) == 8
+    assert list(index._ids()) == list(range(13, 21))
+    assert all(tweet_id not in index for tweet_id in range(1, 13))
+
+
+def test_backward_shift_delete_keeps_probe_chains(tmp_path):
+    # A small capacity in a big ID space forces collisions and many deletes
+    rng = random.Random(7)
+    index = RepliedIndex(tmp_path / 'replied_tweets.bin', capacity=64)
+    expected = deque(maxlen=64)
+    for _ in range(5000):
+        tweet_id = rng.randrange(1, 2 ** 62)
+        index.add(tweet_id)
+        expected.append(tweet_id)
+        probe = rng.choice(expected)
+        assert probe in index
+
+    assert sorted(index._ids()) == sorted(expected)
+    assert sum(1 for slot in index.table if slot) == len(expected)
+
+
+def test_reload_restores_ring_and_membership(tmp_path):
+    path = tmp_path / 'replied_tweets.bin'
+    index = RepliedIndex(path, capacity=16)
+    for tweet_id in range(1, 40):
+        index.add(tweet_id)
+
+    reloaded = RepliedIndex(path, capacity=1000)  # capacity comes from the file
+    assert reloaded.capacity == 16
+    assert list(reloaded._ids()) == list(index._ids())
+    reloaded.add(40)
+    assert 24 not in reloaded and 40 in reloaded
+    assert list(RepliedIndex(path)._ids()) == list(range(25, 41))
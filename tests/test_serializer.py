@@ -0,0 +1,30 @@
+import os
+import stat
+
+from serializer import read_file, write_file
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_file_round_trips(tmp_path):
+    path = tmp_path / 'bot_data.json'
+    write_file(path, {'replied': [1, 2], 'stats': {}})
+    assert read_file(path) == {'replied': [1, 2], 'stats': {}}
+
+
+def test_new_files_get_the_umask_default(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    path = tmp_path / 'users.json'
+    write_file(path, {})
+    assert mode(path) == 0o666 & ~umask
+
+
+def test_rewrites_keep_the_existing_mode(tmp_path):
+    path = tmp_path / 'user.json'
+    write_file(path, {})
+    os.chmod(path, 0o640)
+    write_file(path, {'version': 2})
+    assert mode(path) == 0o640
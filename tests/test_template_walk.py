@@ -0,0 +1,39 @@
+import pytest
+
+from template_walk import TemplateWalk, permute
+from tweet_generator import CATEGORY_BUILDERS, category_size
+
+
+@pytest.mark.parametrize('category', sorted(CATEGORY_BUILDERS))
+def test_permute_is_a_bijection_over_each_category(category):
+    size = category_size(category)
+    key = f"seed:{category}:0"
+    assert sorted(permute(index, size, key) for index in range(size)) == list(range(size))
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 17, 100])
+def test_permute_is_a_bijection_for_small_sizes(size):
+    assert sorted(permute(index, size, 'key') for index in range(size)) == list(range(size))
+
+
+def test_permute_rejects_empty_range():
+    with pytest.raises(ValueError):
+        permute(0, 0, 'key')
+
+
+
+def test_next_unique_tweet_skips_rejected_combinations():
+    walk = TemplateWalk({'seed': 'fixed'})
+    category = min(CATEGORY_BUILDERS, key=category_size)
+    rejected = []
+
+    def is_duplicate(text):
+        if len(rejected) < 2:
+            rejected.append(text)
+            return True
+        return False
+
+    result = walk.next_unique_tweet(is_duplicate, category)
+    assert result is not None and result[1] not in rejected
+    assert walk.coverage()[category]['used'] == 3
+    assert walk.next_unique_tweet(lambda text: True, category) is None
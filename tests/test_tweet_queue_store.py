@@ -0,0 +1,66 @@
+import shutil
+
+import tweet_queue_store
+from tweet_queue_store import TweetQueueFile
+
+
+def test_append_pop_and_compaction_across_instances(tmp_path, monkeypatch):
+    monkeypatch.setattr(tweet_queue_store, 'COMPACT_MIN_BYTES', 64)
+    prefix = tmp_path / 'tweet_queue'
+    first, second = TweetQueueFile(prefix), TweetQueueFile(prefix)
+
+    first.extend(f'tweet {i} ' + 'x' * 20 for i in range(10))
+    second.append('tweet from second')
+    assert len(first) == 11 and first[-1] == 'tweet from second'
+
+    assert second.pop(0) == 'tweet 0 ' + 'x' * 20
+    assert first[0] == 'tweet 1 ' + 'x' * 20
+
+    size_before = first.data_path.stat().st_size
+    for _ in range(6):
+        first.pop(0)
+    # Compacted once dead records outweighed live ones
+    assert first.dead_bytes < first.data_size - first.dead_bytes
+    assert first.data_path.stat().st_size < size_before
+    assert list(second) == [f'tweet {i} ' + 'x' * 20 for i in range(7, 10)] + ['tweet from second']
+    assert list(TweetQueueFile(prefix)) == list(second)
+
+
+def test_rebuilds_stale_index(tmp_path):
+    prefix = tmp_path / 'tweet_queue'
+    queue = TweetQueueFile(prefix)
+    queue.extend(['a', 'b'])
+    stale = tmp_path / 'stale.idx'
+    shutil.copy(queue.index_path, stale)
+    queue.extend(['c'])
+    queue.pop(0)
+    shutil.copy(stale, queue.index_path)
+
+    assert list(TweetQueueFile(prefix)) == ['b', 'c']
+
+
+def test_rebuilds_missing_index(tmp_path):
+    prefix = tmp_path / 'tweet_queue'
+    queue = TweetQueueFile(prefix)
+    queue.extend(['a', 'b', 'c'])
+    queue.pop(1)
+    queue.index_path.unlink()
+
+    rebuilt = TweetQueueFile(prefix)
+    assert list(rebuilt) == ['a', 'c']
+    assert rebuilt.index_path.exists()
+
+
+def test_truncates_torn_final_record(tmp_path):
+    prefix = tmp_path / 'tweet_queue'
+    queue = TweetQueueFile(prefix)
+    queue.extend(['first', 'second'])
+    intact_size = queue.data_path.stat().st_size
+    with open(queue.data_path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x00half a rec')  # claims 64 bytes, has 10
+
+    recovered = TweetQueueFile(prefix)
+    assert list(recovered) == ['first', 'second']
+    assert recovered.data_path.stat().st_size == intact_size
+    recovered.append('third')
+    assert list(TweetQueueFile(prefix)) == ['first', 'second', 'third']
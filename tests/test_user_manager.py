@@ -0,0 +1,25 @@
+from storage import JsonStorage
+from user_manager import UserManager
+
+
+def make_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = JsonStorage(users_file=tmp_path / 'users.json', users_dir=tmp_path / 'users')
+    return UserManager(users_file=tmp_path / 'users.json', storage=storage)
+
+
+def test_username_lookup_ignores_at_and_case(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, monkeypatch)
+    manager.create_user('u1', '@Default_User')
+
+    for username in ('@Default_User', '@default_user', 'default_user', 'DEFAULT_USER'):
+        user = manager.get_user_by_username(username)
+        assert user is not None and user['user_id'] == 'u1'
+    assert manager.get_user_by_username('@someone_else') is None
+
+
+def test_username_lookup_survives_reload(tmp_path, monkeypatch):
+    make_manager(tmp_path, monkeypatch).create_user('u1', '@handle')
+
+    user = make_manager(tmp_path, monkeypatch).get_user_by_username('@handle')
+    assert user is not None and user['user_id'] == 'u1'
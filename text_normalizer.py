@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Text Normalizer - Shared tweet normalization and tokenization
+Normalizes each fetched tweet once (case folding, Unicode/emoji cleanup,
+URL and mention stripping) so every matcher works on the same tokens
+"""
+
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+_MENTION_RE = re.compile(r'@\w+')
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _fold(text: str) -> str:
+    """Case-fold text and flatten Unicode variants to plain characters"""
+    # NFKC maps styled letters (𝐥𝐚𝐧𝐝, ｌａｎｄ) to ASCII; NFKD then splits
+    # accents off so they can be dropped with the invisible format chars
+    # (zero-width joiners, variation selectors) that break up words and emoji
+    text = unicodedata.normalize('NFKD', unicodedata.normalize('NFKC', text).casefold())
+    return ''.join(
+        char for char in text
+        if unicodedata.category(char) not in ('Mn', 'Cf')
+    )
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized word tokens"""
+    return _TOKEN_RE.findall(_fold(text))
+
+
+class NormalizedText:
+    """A tweet's text after normalization, with word tokens for matching"""
+
+    __slots__ = ('original', 'text', 'tokens', 'padded')
+
+    def __init__(self, original: str):
+        self.original = original
+        text = _MENTION_RE.sub(' ', _URL_RE.sub(' ', original))
+        self.text = _fold(text)
+        self.tokens = _TOKEN_RE.findall(self.text)
+        # Space-padded token string so phrase checks stop at word boundaries
+        self.padded = ' ' + ' '.join(self.tokens) + ' '
+
+    def contains(self, phrase: str) -> bool:
+        """Check for a phrase on word boundaries ('land' won't match 'landed')"""
+        return ' ' + ' '.join(tokenize(phrase)) + ' ' in self.padded
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """Normalize tweet text for matching"""
+    return NormalizedText(text or '')
+
+
+class TweetCandidate:
+    """A fetched tweet with its normalized text cached for every matcher"""
+
+    __slots__ = ('tweet', 'id', 'text', 'conversation_id', '_normalized')
+
+    def __init__(self, tweet):
+        self.tweet = tweet
+        self.id = tweet.id
+        self.text = tweet.text
+        self.conversation_id = getattr(tweet, 'conversation_id', None)
+        self._normalized = None
+
+    @property
+    def normalized(self) -> NormalizedText:
+        if self._normalized is None:
+            self._normalized = normalize_text(self.text)
+        return self._normalized
+
+
+class PhraseMatcher:
+    """Word-boundary matcher for a fixed list of trigger phrases"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._phrases = [
+            (phrase, ' ' + ' '.join(tokenize(phrase)) + ' ')
+            for phrase in phrases
+        ]
+
+    def matches(self, normalized: NormalizedText) -> List[str]:
+        """All phrases found in the text, in declaration order"""
+        padded = normalized.padded
+        return [phrase for phrase, needle in self._phrases if needle in padded]
+
+    def first(self, normalized: NormalizedText) -> Optional[str]:
+        """First phrase (in declaration order) found in the text"""
+        padded = normalized.padded
+        for phrase, needle in self._phrases:
+            if needle in padded:
+                return phrase
+        return None
+
+    def any(self, normalized: NormalizedText) -> bool:
+        """Check if any phrase appears in the text"""
+        return self.first(normalized) is not None
@@ -229,127 +229,210 @@ BETTING_AMOUNTS = {
 ACTIONS = ['spend', 'lose', 'waste', 'throw away', 'gamble away']
 
 
-def generate_betting_vs_land_tweet():
-    """Generate a betting vs land comparison tweet"""
-    template = random.choice(TWEET_TEMPLATES['betting_vs_land'])
-    
-    opener = random.choice(template['openers'])
-    stat_amount, stat_desc = random.choice(template['stats'])
-    comparison = random.choice(template['comparisons'])
-    closer = random.choice(template['closers'])
+# Phrasings for betting vs land tweets
+BETTING_VS_LAND_PHRASINGS = [
+    "{opener}: {stat_amount} {stat_desc}. {comparison}. {closer}",
+    "{opener}: Nigerians {stat_desc} {stat_amount}. {comparison}. {closer}",
+]
+
+# Land equivalents (people in millions, sqm) for each betting stat
+STAT_EQUIVALENTS = {
+    '3.2 TRILLION': (6.4, 640000),
+    '450 BILLION': (0.9, 90000),
+    '2.8 TRILLION': (5.6, 560000),
+    '87 BILLION': (0.17, 17400),
+    '150 BILLION': (0.3, 30000)
+}
+
+
+def _opener_variants(openers):
+    """Expand openers by action word, only where the opener uses one"""
+    return [
+        (opener, action)
+        for opener in openers
+        for action in (ACTIONS if '{action}' in opener else [None])
+    ]
+
+
+def _amount_rows():
+    """Every (frequency, amount row) pair"""
+    return [
+        (frequency, row)
+        for frequency, rows in BETTING_AMOUNTS.items()
+        for row in rows
+    ]
+
+
+# Template space: the option lists each category's tweets are built from.
+# Every combination of one option per list renders to a distinct tweet.
+def _betting_vs_land_axes(template):
+    return [template['openers'], template['stats'], template['comparisons'],
+            template['closers'], BETTING_VS_LAND_PHRASINGS]
+
+
+def _betting_losses_axes(template):
+    return [_amount_rows(), _opener_variants(template['openers']), template['calculations'],
+            template['land_comparison'], template['closers']]
+
+
+def _success_rates_axes(template):
+    return [template['openers'], template['betting_stats'], template['land_stats'],
+            template['closers']]
+
+
+def _land_appreciation_axes(template):
+    return [template['openers'], template['price_history'], template['projections'],
+            template['closers']]
+
+
+def _demographics_axes(template):
+    return [template['openers'], template['age_stats'], template['loss_stats'],
+            template['land_comparison'], template['closers']]
+
+
+def _house_edge_axes(template):
+    return [template['openers'], template['betting_edge'], template['land_appreciation'],
+            template['closers']]
+
+
+def _render_betting_vs_land(opener, stat, comparison, closer, phrasing):
+    """Render a betting vs land comparison tweet"""
+    stat_amount, stat_desc = stat
     
     # Calculate people/sqm based on stat
-    if '3.2 TRILLION' in stat_amount:
-        people = 6.4
-        sqm = 640000
-    elif '450 BILLION' in stat_amount:
-        people = 0.9
-        sqm = 90000
-    elif '2.8 TRILLION' in stat_amount:
-        people = 5.6
-        sqm = 560000
-    elif '87 BILLION' in stat_amount:
-        people = 0.17
-        sqm = 17400
-    elif '150 BILLION' in stat_amount:
-        people = 0.3
-        sqm = 30000
-    else:
-        people = 1.0
-        sqm = 100000
+    people, sqm = 1.0, 100000
+    for key, equivalent in STAT_EQUIVALENTS.items():
+        if key in stat_amount:
+            people, sqm = equivalent
+            break
     
     comparison_text = comparison.format(people=int(people), sqm=int(sqm))
-    
-    # Vary the phrasing
-    phrasing_options = [
-        f"{opener}: {stat_amount} {stat_desc}. {comparison_text}. {closer}",
-        f"{opener}: Nigerians {stat_desc} {stat_amount}. {comparison_text}. {closer}",
-        f"{opener}: {stat_amount} {stat_desc}. {comparison_text}. {closer}",
-    ]
-    
-    tweet = random.choice(phrasing_options)
-    return tweet
+    return phrasing.format(opener=opener, stat_amount=stat_amount, stat_desc=stat_desc,
+                           comparison=comparison_text, closer=closer)
 
 
-def generate_betting_loss_tweet():
-    """Generate a betting loss calculation tweet"""
-    template = random.choice(TWEET_TEMPLATES['betting_losses'])
+def _render_betting_losses(amount_row, opener_variant, calculation, land_comp, closer):
+    """Render a betting loss calculation tweet"""
+    frequency, (amount, yearly, sqm, appreciation) = amount_row
+    opener, action = opener_variant
     
-    frequency = random.choice(['daily', 'weekly', 'monthly'])
-    amount, yearly, sqm, appreciation = random.choice(BETTING_AMOUNTS[frequency])
-    action = random.choice(ACTIONS)
-    
-    opener = random.choice(template['openers']).format(
-        amount=amount, frequency=frequency, action=action
-    )
-    calculation = random.choice(template['calculations']).format(
-        yearly=f"{yearly:,}"
-    )
-    land_comp = random.choice(template['land_comparison']).format(
+    opener = opener.format(amount=amount, frequency=frequency, action=action)
+    calculation = calculation.format(yearly=f"{yearly:,}")
+    land_comp = land_comp.format(
         amount=amount, frequency=frequency, sqm=sqm, 
         appreciation=f"{appreciation:,}", yearly=f"{yearly:,}"
     )
-    closer = random.choice(template['closers'])
     
     # Fix double currency symbol issue
     opener = opener.replace('₦₦', '₦')
     land_comp = land_comp.replace('₦₦', '₦')
     
-    tweet = f"{opener} {calculation}. {land_comp}. {closer}"
-    return tweet
+    return f"{opener} {calculation}. {land_comp}. {closer}"
+
+
+def _render_success_rates(opener, betting_stat, land_stat, closer):
+    """Render a success rate comparison tweet"""
+    return f"{opener}: {betting_stat}. {land_stat}. {closer}"
+
+
+def _render_land_appreciation(opener, price_history, projection, closer):
+    """Render a land appreciation tweet"""
+    old_price, time_ago, new_price, percent = price_history
+    return f"{opener} {old_price} {time_ago}. Today it's worth {new_price}. That's {percent} appreciation. {projection}. {closer}"
+
+
+def _render_demographics(opener, age_stat, loss_stat, comparison, closer):
+    """Render a demographics-focused tweet"""
+    return f"{opener}: {age_stat}. {loss_stat}. {comparison} to betting companies. Meanwhile, 500 sqm in 2 Seasons = ₦2.5M today, ₦4M+ in 3 years. {closer}"
+
+
+def _render_house_edge(opener, betting_edge, land_app, closer):
+    """Render a house edge comparison tweet"""
+    return f"{opener}: {betting_edge}. {land_app}. {closer}"
+
+
+# category -> (axes builder, renderer)
+CATEGORY_BUILDERS = {
+    'betting_vs_land': (_betting_vs_land_axes, _render_betting_vs_land),
+    'betting_losses': (_betting_losses_axes, _render_betting_losses),
+    'success_rates': (_success_rates_axes, _render_success_rates),
+    'land_appreciation': (_land_appreciation_axes, _render_land_appreciation),
+    'demographics': (_demographics_axes, _render_demographics),
+    'house_edge': (_house_edge_axes, _render_house_edge)
+}
+
+
+def _template_sizes(category):
+    """(template, axes, combinations) for each template in a category"""
+    build_axes = CATEGORY_BUILDERS[category][0]
+    sizes = []
+    for template in TWEET_TEMPLATES[category]:
+        axes = build_axes(template)
+        combinations = 1
+        for axis in axes:
+            combinations *= len(axis)
+        sizes.append((template, axes, combinations))
+    return sizes
+
+
+def category_size(category):
+    """Number of distinct tweets a category can produce"""
+    return sum(combinations for _, _, combinations in _template_sizes(category))
+
+
+def template_space():
+    """Number of distinct tweets per category"""
+    return {category: category_size(category) for category in CATEGORY_BUILDERS}
+
+
+def render_tweet(category, index):
+    """Render combination number `index` (0 <= index < category_size) of a category"""
+    for template, axes, combinations in _template_sizes(category):
+        if index >= combinations:
+            index -= combinations
+            continue
+        # Decode index as a mixed-radix number, one digit per axis
+        parts = []
+        for axis in reversed(axes):
+            index, digit = divmod(index, len(axis))
+            parts.append(axis[digit])
+        parts.reverse()
+        return CATEGORY_BUILDERS[category][1](*parts)
+    raise IndexError(f"Combination out of range for {category}")
+
+
+def _random_tweet(category):
+    return render_tweet(category, random.randrange(category_size(category)))
+
+
+def generate_betting_vs_land_tweet():
+    """Generate a betting vs land comparison tweet"""
+    return _random_tweet('betting_vs_land')
+
+
+def generate_betting_loss_tweet():
+    """Generate a betting loss calculation tweet"""
+    return _random_tweet('betting_losses')
 
 
 def generate_success_rate_tweet():
     """Generate a success rate comparison tweet"""
-    template = random.choice(TWEET_TEMPLATES['success_rates'])
-    
-    opener = random.choice(template['openers'])
-    betting_stat = random.choice(template['betting_stats'])
-    land_stat = random.choice(template['land_stats'])
-    closer = random.choice(template['closers'])
-    
-    tweet = f"{opener}: {betting_stat}. {land_stat}. {closer}"
-    return tweet
+    return _random_tweet('success_rates')
 
 
 def generate_land_appreciation_tweet():
     """Generate a land appreciation tweet"""
-    template = random.choice(TWEET_TEMPLATES['land_appreciation'])
-    
-    opener = random.choice(template['openers'])
-    old_price, time_ago, new_price, percent = random.choice(template['price_history'])
-    projection = random.choice(template['projections'])
-    closer = random.choice(template['closers'])
-    
-    tweet = f"{opener} {old_price} {time_ago}. Today it's worth {new_price}. That's {percent} appreciation. {projection}. {closer}"
-    return tweet
+    return _random_tweet('land_appreciation')
 
 
 def generate_demographics_tweet():
     """Generate a demographics-focused tweet"""
-    template = random.choice(TWEET_TEMPLATES['demographics'])
-    
-    opener = random.choice(template['openers'])
-    age_stat = random.choice(template['age_stats'])
-    loss_stat = random.choice(template['loss_stats'])
-    comparison = random.choice(template['land_comparison'])
-    closer = random.choice(template['closers'])
-    
-    tweet = f"{opener}: {age_stat}. {loss_stat}. {comparison} to betting companies. Meanwhile, 500 sqm in 2 Seasons = ₦2.5M today, ₦4M+ in 3 years. {closer}"
-    return tweet
+    return _random_tweet('demographics')
 
 
 def generate_house_edge_tweet():
     """Generate a house edge comparison tweet"""
-    template = random.choice(TWEET_TEMPLATES['house_edge'])
-    
-    opener = random.choice(template['openers'])
-    betting_edge = random.choice(template['betting_edge'])
-    land_app = random.choice(template['land_appreciation'])
-    closer = random.choice(template['closers'])
-    
-    tweet = f"{opener}: {betting_edge}. {land_app}. {closer}"
-    return tweet
+    return _random_tweet('house_edge')
 
 
 # Main generator function
@@ -375,4 +458,7 @@ if __name__ == "__main__":
     print("Generating sample tweets...\n")
     for i in range(5):
         print(f"{i+1}. {generate_tweet()}\n")
-
+    
+    print("Template space:")
+    for category, size in template_space().items():
+        print(f"  {category}: {size:,} distinct tweets")
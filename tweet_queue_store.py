@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Tweet Queue Store - Record file plus offset index for large tweet queues
+tweet_queue.dat holds length-prefixed records and is memory-mapped, so
+reading tweet k never parses the rest of the queue. tweet_queue.idx holds
+the offset of each live record in queue order. Appends add one record and
+one offset. Deletes tombstone the record and drop its offset. Dead records
+are compacted away once they outweigh the live ones.
+
+The record file is authoritative: the index is rebuilt from it whenever it
+is missing or out of date. Writers hold a FileLock, so several processes
+can edit the same queue.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from state_lock import FileLock
+from storage import get_storage
+from user_paths import user_file
+
+_RECORD = struct.Struct('<IB')     # text length, flags
+_INDEX = struct.Struct('<4sIQQ')   # magic, count, data file size, dead bytes
+_MAGIC = b'TQIX'
+_LIVE, _DELETED = 0, 1
+
+COMPACT_MIN_BYTES = 64 * 1024  # don't bother compacting below this
+
+
+class TweetQueueFile:
+    """
+    List-like tweet queue backed by <prefix>.dat and <prefix>.idx.
+    Supports len(), indexing, iteration, append() and pop(k).
+    """
+
+    def __init__(self, prefix):
+        prefix = Path(prefix)
+        self.data_path = prefix.with_suffix('.dat')
+        self.index_path = prefix.with_suffix('.idx')
+        self._lock = threading.RLock()
+        self._map: Optional[mmap.mmap] = None
+        self.offsets = array('Q')
+        self.data_size = 0
+        self.dead_bytes = 0
+        self._stamp = None
+        self.load()
+
+    # --- Loading ------------------------------------------------------
+
+    def _index_stamp(self):
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """Load the offset index, rebuilding it if it doesn't match the record file"""
+        with self._lock:
+            self._close_map()
+            data_size = self.data_path.stat().st_size if self.data_path.exists() else 0
+            if not self._load_index(data_size):
+                self._rebuild(data_size)
+            self._stamp = self._index_stamp()
+
+    def _load_index(self, data_size: int) -> bool:
+        if not self.index_path.exists():
+            return False
+        with open(self.index_path, 'rb') as f:
+            header = f.read(_INDEX.size)
+            if len(header) < _INDEX.size:
+                return False
+            magic, count, indexed_size, dead_bytes = _INDEX.unpack(header)
+            if magic != _MAGIC or indexed_size != data_size:
+                return False
+            offsets = array('Q')
+            offsets.frombytes(f.read(8 * count))
+        if len(offsets) != count:
+            return False
+        self.offsets, self.data_size, self.dead_bytes = offsets, data_size, dead_bytes
+        return True
+
+    def _rebuild(self, data_size: int):
+        """Recover the index by scanning the record file"""
+        offsets, dead_bytes, offset = array('Q'), 0, 0
+        view = self._view()
+        while offset + _RECORD.size <= data_size:
+            length, flags = _RECORD.unpack_from(view, offset)
+            end = offset + _RECORD.size + length
+            if end > data_size:
+                break  # torn final record
+            if flags == _LIVE:
+                offsets.append(offset)
+            else:
+                dead_bytes += end - offset
+            offset = end
+        if offset != data_size:
+            # Drop a partially written record so appends stay aligned
+            self._close_map()
+            with open(self.data_path, 'r+b') as f:
+                f.truncate(offset)
+        self.offsets, self.data_size, self.dead_bytes = offsets, offset, dead_bytes
+        if self.data_path.exists():
+            self._write_index(0)
+
+    def _sync(self):
+        """Reload if another process changed the queue"""
+        if self._index_stamp() != self._stamp:
+            self.load()
+
+    # --- Reading ------------------------------------------------------
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _view(self):
+        """Memory map of the record file, remapped when it has grown"""
+        if self._map is None or len(self._map) < self.data_size:
+            self._close_map()
+            if not self.data_path.exists() or self.data_path.stat().st_size == 0:
+                return b''
+            with open(self.data_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _read(self, offset: int) -> str:
+        view = self._view()
+        length, flags = _RECORD.unpack_from(view, offset)
+        if flags != _LIVE:
+            raise LookupError(offset)
+        start = offset + _RECORD.size
+        return bytes(view[start:start + length]).decode('utf-8')
+
+    @property
+    def version(self):
+        """Changes whenever the queue does (for cache validators)"""
+        with self._lock:
+            self._sync()
+            return self._stamp
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self.offsets)
+
+    def __getitem__(self, index: int) -> str:
+        with self._lock:
+            self._sync()
+            try:
+                return self._read(self.offsets[index])
+            except LookupError:
+                # Tombstoned but still indexed: a delete was interrupted
+                self._rebuild(self.data_size)
+                return self._read(self.offsets[index])
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._sync()
+            offsets = array('Q', self.offsets)
+        for offset in offsets:
+            with self._lock:
+                try:
+                    yield self._read(offset)
+                except LookupError:
+                    continue
+
+    # --- Writing ------------------------------------------------------
+
+    def _write_index(self, start: int):
+        """Rewrite the header and the offsets from position start onwards"""
+        mode = 'r+b' if self.index_path.exists() else 'w+b'
+        with open(self.index_path, mode) as f:
+            f.write(_INDEX.pack(_MAGIC, len(self.offsets), self.data_size, self.dead_bytes))
+            f.seek(_INDEX.size + 8 * start)
+            f.write(self.offsets[start:].tobytes())
+            f.truncate()
+        self._stamp = self._index_stamp()
+
+    def append(self, text: str):
+        """Add a tweet to the end of the queue"""
+        self.extend([text])
+
+    def extend(self, texts: Iterable[str]):
+        """Add tweets to the end of the queue with a single index write"""
+        with self._lock, FileLock(self.data_path):
+            self._sync()
+            start = len(self.offsets)
+            chunks = []
+            offset = self.data_size
+            for text in texts:
+                encoded = text.encode('utf-8')
+                chunks.append(_RECORD.pack(len(encoded), _LIVE) + encoded)
+                self.offsets.append(offset)
+                offset += _RECORD.size + len(encoded)
+            self.data_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.data_path, 'ab') as f:
+                f.write(b''.join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+            self.data_size = offset
+            self._write_index(start)
+
+    def pop(self, index: int = -1) -> str:
+        """Remove and return tweet at index"""
+        with self._lock, FileLock(self.data_path):
+            self._sync()
+            offset = self.offsets[index]
+            text = self._read(offset)
+            if index < 0:
+                index += len(self.offsets)
+            # Tombstone first: the record file stays authoritative if we stop here
+            with open(self.data_path, 'r+b') as f:
+                f.seek(offset + 4)
+                f.write(bytes([_DELETED]))
+            del self.offsets[index]
+            self.dead_bytes += _RECORD.size + len(text.encode('utf-8'))
+            self._write_index(index)
+            if self.dead_bytes >= COMPACT_MIN_BYTES and self.dead_bytes > self.data_size - self.dead_bytes:
+                self._compact()
+            return text
+
+    def compact(self):
+        """Rewrite the record file without tombstoned records"""
+        with self._lock, FileLock(self.data_path):
+            self._sync()
+            self._compact()
+
+    def _compact(self):
+        view = self._view()
+        temp_path = self.data_path.with_name(self.data_path.name + '.tmp')
+        offsets, offset = array('Q'), 0
+        with open(temp_path, 'wb') as f:
+            for start in self.offsets:
+                length, _ = _RECORD.unpack_from(view, start)
+                end = start + _RECORD.size + length
+                f.write(view[start:end])
+                offsets.append(offset)
+                offset += end - start
+            f.flush()
+            os.fsync(f.fileno())
+        self._close_map()
+        os.replace(temp_path, self.data_path)
+        # A crash before the index is rewritten is caught by its size check
+        self.offsets, self.data_size, self.dead_bytes = offsets, offset, 0
+        self._write_index(0)
+
+
+_queues: Dict[Path, TweetQueueFile] = {}
+_queues_lock = threading.Lock()
+
+
+def _queue_prefix(user_id: str) -> Path:
+    return user_file(user_id, 'tweet_queue')
+
+
+def _shared(prefix: Path) -> TweetQueueFile:
+    """One TweetQueueFile per queue in this process, shared by bots and pages"""
+    with _queues_lock:
+        queue = _queues.get(prefix)
+        if queue is None:
+            queue = _queues[prefix] = TweetQueueFile(prefix)
+        return queue
+
+
+def open_tweet_queue(user_id: str) -> Optional[TweetQueueFile]:
+    """
+    The user's own tweet queue, or None if they use the default queue.
+    A queue saved as a tweet_queue document is converted on first use.
+    """
+    prefix = _queue_prefix(user_id)
+    if not prefix.with_suffix('.dat').exists():
+        legacy = get_storage().load_document(user_id, 'tweet_queue')
+        if legacy is None:
+            return None
+        return create_tweet_queue(user_id, legacy)
+    return _shared(prefix)
+
+
+def create_tweet_queue(user_id: str, tweets: Iterable[str]) -> TweetQueueFile:
+    """Give the user their own queue, starting from tweets"""
+    queue = _shared(_queue_prefix(user_id))
+    with queue._lock:
+        if not queue.data_path.exists():
+            queue.extend(tweets)
+    return queue
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Twitter Clients - One reusable tweepy client per account
+Bots, restarts and ad-hoc posts for a user share a client instead of
+decrypting credentials and building a new one each time. A client is
+rebuilt when the user's tokens change and dropped when they are deleted.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+import tweepy
+
+from credentials import CredentialManager
+
+TOKEN_FIELDS = ('bearer_token', 'api_key', 'api_secret', 'access_token', 'access_token_secret')
+
+
+class ClientPool:
+    """tweepy clients by user ID, keyed on the tokens they were built with"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Tuple[tuple, tweepy.Client]] = {}
+
+    def get(self, user_id: str) -> tweepy.Client:
+        """Client for user_id (credentials come from the decrypted cache)"""
+        try:
+            credentials = CredentialManager(user_id).load_credentials()
+        except FileNotFoundError:
+            self.invalidate(user_id)
+            raise
+        tokens = tuple(credentials.get(field, '') for field in TOKEN_FIELDS)
+
+        entry = self._clients.get(user_id)
+        if entry is not None and entry[0] == tokens:
+            return entry[1]
+        with self._lock:
+            entry = self._clients.get(user_id)
+            if entry is None or entry[0] != tokens:
+                bearer_token, api_key, api_secret, access_token, access_token_secret = tokens
+                client = tweepy.Client(
+                    bearer_token=bearer_token,
+                    consumer_key=api_key,
+                    consumer_secret=api_secret,
+                    access_token=access_token,
+                    access_token_secret=access_token_secret,
+                    wait_on_rate_limit=True
+                )
+                entry = self._clients[user_id] = (tokens, client)
+            return entry[1]
+
+    def invalidate(self, user_id: str = None):
+        """Drop pooled clients so they are rebuilt on next use"""
+        with self._lock:
+            if user_id is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(user_id, None)
+
+
+# Shared by every bot and request in this process
+CLIENT_POOL = ClientPool()
@@ -3,34 +3,241 @@
 User Management - Handles user accounts and authentication
 """
 
-import json
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Callable, Dict, Iterable, List, Optional
 from credentials import CredentialManager
+from config_layers import base_config, config_delta, resolve_config
+from content_registry import freeze, thaw
+from state_lock import VersionConflict, retry_on_conflict
+from storage import NO_RECORD, JsonStorage, Storage, get_storage
+from user_paths import user_dir
+
+# Fields with secondary indexes (the SQLite backend indexes the same columns)
+INDEXED_FIELDS = ('twitter_id', 'username', 'email')
+
+
+def _index_key(field: str, value) -> Optional[str]:
+    """Normalized index key: IDs exact, handles and emails case-insensitive"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if field == 'username':
+        value = value.lstrip('@')  # stored as "@handle", looked up either way
+    if field != 'twitter_id':
+        value = value.lower()
+    return value or None
+
+
+def _migrate_config(user: dict):
+    """
+    Users created before layered config hold a full copy of the config
+    (with whole-value replacement); keep only what differs from defaults
+    """
+    if 'config_preset' in user:
+        return
+    base = base_config()
+    config = dict(base)
+    config.update(user.get('bot_config') or {})
+    user['config_preset'] = None
+    user['bot_config'] = config_delta(config, base)
+
+
+
+def _config_change(change: Callable[[dict], None]) -> Callable[[dict], None]:
+    """User change that edits the effective config and stores the delta"""
+    def apply(user):
+        _migrate_config(user)
+        config = thaw(resolve_config(user['bot_config'], user['config_preset']))
+        change(config)
+        user['bot_config'] = config_delta(config, base_config(user['config_preset']))
+    return apply
+
+
+def _preset_change(preset: Optional[str]) -> Callable[[dict], None]:
+    def apply(user):
+        _migrate_config(user)
+        user['config_preset'] = preset
+    return apply
+
 
 class UserManager:
-    """Manages user accounts and authentication"""
+    """
+    Manages user accounts and authentication.
+    
+    Users are reloaded whenever storage reports that someone else changed
+    them. Lookups return read-only snapshots; change users through
+    update_user / update_user_config. Each save is a compare-and-swap on
+    the record's version, so concurrent writers (other worker processes)
+    never overwrite each other's changes.
+    """
     
-    def __init__(self, users_file: str = 'users.json'):
+    def __init__(self, users_file: str = 'users.json', storage: Storage = None):
         self.users_file = Path(users_file)
-        self.users = self._load_users()
+        if storage is None:
+            storage = get_storage()
+            if isinstance(storage, JsonStorage) and storage.users_file != self.users_file:
+                storage = JsonStorage(users_file=users_file)
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._reload()
     
     def _load_users(self) -> dict:
-        """Load users from JSON file"""
-        if self.users_file.exists():
-            with open(self.users_file, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load users from storage"""
+        return self.storage.load_users()
+    
+    def _reload(self):
+        self._version = self.storage.users_version()
+        self.users = self._load_users()
+        self._snapshots = {}
+        self._configs = {}
+        self._rebuild_indexes()
+    
+    def _refresh(self):
+        """Re-read the users changed in storage since we last read or wrote them"""
+        with self._lock:
+            version = self.storage.users_version()
+            if version == self._version:
+                return
+            changed = self.storage.users_changed_since(self._version)
+            if changed is None:
+                self._reload()
+                return
+            for user_id in changed:
+                self._set_user(user_id, self.storage.get_user(user_id))
+            self._version = version
+    
+    def _snapshot(self, user_id: Optional[str]) -> Optional[Dict]:
+        """Read-only view of a user, shared until the user changes"""
+        if user_id is None:
+            return None
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is None and user_id in self.users:
+            snapshot = self._snapshots[user_id] = freeze(self.users[user_id])
+        return snapshot
+    
+    def _rebuild_indexes(self):
+        """Build the secondary indexes (field -> key -> user_id)"""
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        for user_id, user in self.users.items():
+            self._index_user(user_id, user)
+    
+    def _index_user(self, user_id: str, user: dict):
+        for field in INDEXED_FIELDS:
+            key = _index_key(field, user.get(field))
+            if key is not None:
+                self.indexes[field][key] = user_id
     
-    def _save_users(self):
-        """Save users to JSON file"""
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f, indent=2)
+    def _unindex_user(self, user_id: str, user: dict):
+        for field in INDEXED_FIELDS:
+            key = _index_key(field, user.get(field))
+            if key is not None and self.indexes[field].get(key) == user_id:
+                del self.indexes[field][key]
+    
+    def _find_user(self, field: str, value) -> Optional[Dict]:
+        """Look up a user through a secondary index"""
+        with self._lock:
+            self._refresh()
+            return self._snapshot(self.indexes[field].get(_index_key(field, value)))
+    
+    def _set_user(self, user_id: str, user: Optional[dict]):
+        """Replace our copy of a user, keeping indexes and snapshots in step"""
+        current = self.users.pop(user_id, None)
+        if current is not None:
+            self._unindex_user(user_id, current)
+        if user is not None:
+            self.users[user_id] = user
+            self._index_user(user_id, user)
+        self._snapshots.pop(user_id, None)
+    
+    def _commit(self, user_id: str, change, create: bool = False):
+        """
+        Apply change (which edits a user dict in place) and save the result,
+        provided the stored user still has the version we started from.
+        On conflict the user is re-read and change applied again.
+        """
+        def attempt():
+            current = self.users.get(user_id)
+            if create and current is not None:
+                raise ValueError(f"User {user_id} already exists")
+            if not create and current is None:
+                raise ValueError(f"User {user_id} not found")
+            
+            user = thaw(current) if current is not None else {}
+            change(user)
+            expected = current.get('version', 0) if current is not None else NO_RECORD
+            user['version'] = max(expected, 0) + 1
+            
+            before = self.storage.users_version()
+            try:
+                self.storage.put_user(user_id, user, expected_version=expected)
+            except VersionConflict:
+                self._set_user(user_id, self.storage.get_user(user_id))
+                raise
+            self._set_user(user_id, user)
+            # Skip our own write on the next refresh, unless someone else wrote too
+            if before == self._version:
+                self._version = self.storage.users_version()
+        
+        with self._lock:
+            self._refresh()
+            retry_on_conflict(attempt)
+    
+    def _commit_many(self, changes: Dict[str, Callable[[dict], None]], create: bool = False):
+        """
+        _commit for many users: one storage write for the whole batch. A
+        conflict on any user saves none of them; the batch is re-read and
+        applied again. (Atomic against crashes only on SQLite.)
+        """
+        def attempt():
+            users, expected_versions = {}, {}
+            for user_id, change in changes.items():
+                current = self.users.get(user_id)
+                if create and current is not None:
+                    raise ValueError(f"User {user_id} already exists")
+                if not create and current is None:
+                    raise ValueError(f"User {user_id} not found")
+                user = thaw(current) if current is not None else {}
+                change(user)
+                expected = current.get('version', 0) if current is not None else NO_RECORD
+                user['version'] = max(expected, 0) + 1
+                users[user_id], expected_versions[user_id] = user, expected
+            
+            before = self.storage.users_version()
+            try:
+                self.storage.put_users(users, expected_versions)
+            except VersionConflict:
+                for user_id in changes:
+                    self._set_user(user_id, self.storage.get_user(user_id))
+                raise
+            for user_id, user in users.items():
+                self._set_user(user_id, user)
+            if before == self._version:
+                self._version = self.storage.users_version()
+        
+        with self._lock:
+            self._refresh()
+            retry_on_conflict(attempt)
+    
+    @staticmethod
+    def _new_user(user_id: str, username: str, email: str = None,
+                  twitter_id: str = None, preset: str = None) -> dict:
+        return {
+            'user_id': user_id,
+            'username': username,
+            'email': email,
+            'twitter_id': twitter_id,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'twitter_connected': False,
+            'bot_active': False,
+            'config_preset': preset,
+            'bot_config': {}  # Overrides only; see config_layers
+        }
     
     def create_user(self, user_id: str, username: str, email: str = None, 
-                   twitter_id: str = None) -> Dict:
+                   twitter_id: str = None, preset: str = None) -> Dict:
         """
         Create a new user account
         
@@ -39,47 +246,63 @@ class UserManager:
             username: Username (e.g., Twitter handle)
             email: Optional email address
             twitter_id: Optional Twitter ID
+            preset: Optional config preset (see config_layers.PRESETS)
             
         Returns:
             User data dictionary
         """
-        if user_id in self.users:
-            raise ValueError(f"User {user_id} already exists")
+        user_data = self._new_user(user_id, username, email, twitter_id, preset)
+        self._commit(user_id, lambda user: user.update(user_data), create=True)
         
-        user_data = {
-            'user_id': user_id,
-            'username': username,
-            'email': email,
-            'twitter_id': twitter_id,
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'twitter_connected': False,
-            'bot_active': False,
-            'bot_config': self._get_default_config()
-        }
+        # Create user directory
+        user_dir(user_id).mkdir(parents=True, exist_ok=True)
         
-        self.users[user_id] = user_data
-        self._save_users()
+        return self._snapshot(user_id)
+    
+    def create_users(self, accounts: Iterable[dict], preset: str = None) -> List[Dict]:
+        """
+        Create many accounts in one batch. If any already exists none are
+        created; a crash partway through can leave some created, except on
+        SQLite where the batch is one transaction.
         
-        # Create user directory
-        user_dir = Path('users') / user_id
-        user_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            accounts: Dicts with user_id and username, optionally email,
+                twitter_id and preset (overriding the batch preset)
+            preset: Config preset for accounts that don't name one
+            
+        Returns:
+            The created users. User directories are created on first use.
+        """
+        records = {}
+        for account in accounts:
+            user_id = str(account['user_id'])
+            if user_id in records:
+                raise ValueError(f"User {user_id} appears twice in the batch")
+            records[user_id] = self._new_user(
+                user_id, account['username'], account.get('email'),
+                account.get('twitter_id'), account.get('preset', preset)
+            )
         
-        return user_data
+        self._commit_many(
+            {user_id: (lambda user, record=record: user.update(record)) for user_id, record in records.items()},
+            create=True
+        )
+        return [self._snapshot(user_id) for user_id in records]
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user data by user_id"""
-        return self.users.get(user_id)
+        with self._lock:
+            self._refresh()
+            return self._snapshot(user_id)
     
     def update_user(self, user_id: str, **kwargs):
         """Update user data"""
-        if user_id not in self.users:
-            raise ValueError(f"User {user_id} not found")
-        
-        for key, value in kwargs.items():
-            if key in self.users[user_id]:
-                self.users[user_id][key] = value
+        def change(user):
+            for key, value in kwargs.items():
+                if key in user:
+                    user[key] = value
         
-        self._save_users()
+        self._commit(user_id, change)
     
     def set_twitter_connected(self, user_id: str, connected: bool = True):
         """Mark user's Twitter account as connected"""
@@ -91,86 +314,76 @@ class UserManager:
     
     def get_user_by_twitter_id(self, twitter_id: str) -> Optional[Dict]:
         """Find user by Twitter ID"""
-        for user in self.users.values():
-            if user.get('twitter_id') == twitter_id:
-                return user
-        return None
+        return self._find_user('twitter_id', twitter_id)
+    
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Find user by username (case-insensitive, leading @ ignored)"""
+        return self._find_user('username', username)
+    
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        """Find user by email (case-insensitive)"""
+        return self._find_user('email', email)
     
     def list_users(self) -> list:
         """List all users"""
-        return list(self.users.values())
-    
-    def _get_default_config(self) -> dict:
-        """Get default bot configuration"""
-        return {
-            'tweets_per_day': 6,
-            'posting_times': ['16:00', '20:00', '00:00', '04:00', '08:00', '12:00'],
-            'engagement_interval': 15,  # minutes
-            'max_replies_per_hour': 5,
-            'keywords': {
-                'betting': [
-                    'betting loss Nigeria',
-                    'lost money betting',
-                    'stop betting',
-                    'gambling addiction',
-                    'bet9ja losses',
-                    'sports betting',
-                    'sports betting waste',
-                    'betking loss',
-                    'sportybet loss',
-                    'bet9ja regret'
-                ],
-                'investment': [
-                    'how to invest Nigeria',
-                    'passive income Nigeria',
-                    'investment opportunities',
-                    'investment opportunities Nigeria',
-                    'where to invest',
-                    'where to invest Nigeria',
-                    'wealth building',
-                    'small money investment'
-                ],
-                'land': [
-                    'buy land Lagos',
-                    'buy land Abeokuta',
-                    'land ownership Nigeria',
-                    'affordable land',
-                    'affordable land Nigeria',
-                    'land investment',
-                    'real estate Lagos',
-                    'farmland Nigeria',
-                    'real estate investment Nigeria',
-                    'property investment Nigeria'
-                ],
-                'co_ownership': [
-                    'fractional ownership',
-                    'fractional ownership Nigeria',
-                    'co-ownership property',
-                    'shared ownership',
-                    'shared ownership real estate',
-                    'real estate syndication',
-                    'group land purchase'
-                ]
-            }
-        }
+        with self._lock:
+            self._refresh()
+            return [self._snapshot(user_id) for user_id in self.users]
     
     def get_user_config(self, user_id: str) -> dict:
-        """Get user's bot configuration"""
-        user = self.get_user(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        return user.get('bot_config', self._get_default_config())
+        """Get user's effective bot configuration (read-only)"""
+        with self._lock:
+            user = self.get_user(user_id)
+            if not user:
+                raise ValueError(f"User {user_id} not found")
+            if 'config_preset' not in user:
+                self._commit(user_id, _migrate_config)
+                user = self._snapshot(user_id)
+            # Memoized until the user's snapshot changes
+            cached = self._configs.get(user_id)
+            if cached is None or cached[0] is not user:
+                config = resolve_config(user.get('bot_config'), user.get('config_preset'))
+                cached = self._configs[user_id] = (user, config)
+            return cached[1]
+    
+    def modify_user_config(self, user_id: str, change):
+        """
+        Edit user's effective config in place with change(config), storing
+        only what differs from the preset. change may run more than once if
+        another writer saves the user at the same time.
+        """
+        self._commit(user_id, _config_change(change))
     
     def update_user_config(self, user_id: str, config: dict):
         """Update user's bot configuration"""
-        user = self.get_user(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        
-        # Merge with existing config
-        current_config = user.get('bot_config', {})
-        current_config.update(config)
-        self.update_user(user_id, bot_config=current_config)
+        self.modify_user_config(user_id, lambda current: current.update(thaw(config)))
+    
+    def modify_users_config(self, user_ids: Iterable[str], change):
+        """modify_user_config for many users, saved as one batch"""
+        apply = _config_change(change)
+        self._commit_many({user_id: apply for user_id in user_ids})
+    
+    def update_users_config(self, user_ids: Iterable[str], config: dict):
+        """Apply the same config changes to many users at once"""
+        self.modify_users_config(user_ids, lambda current: current.update(thaw(config)))
+    
+    def set_users_preset(self, user_ids: Iterable[str], preset: Optional[str]):
+        """Move many users to a preset at once, keeping their own overrides"""
+        apply = _preset_change(preset)
+        self._commit_many({user_id: apply for user_id in user_ids})
+    
+    def set_config_preset(self, user_id: str, preset: Optional[str]):
+        """Switch user to another preset, keeping their own overrides"""
+        self._commit(user_id, _preset_change(preset))
+    
+    def compact_configs(self) -> int:
+        """Migrate every full stored config to overrides. Returns users changed."""
+        with self._lock:
+            self._refresh()
+            legacy = [user_id for user_id, user in self.users.items() if 'config_preset' not in user]
+            for user_id in legacy:
+                self._commit(user_id, _migrate_config)
+        return len(legacy)
     
     def get_user_credentials(self, user_id: str) -> Optional[dict]:
         """Get user's Twitter credentials (decrypted)"""
@@ -183,3 +396,14 @@ class UserManager:
         return None
 
 
+_user_manager: Optional[UserManager] = None
+_user_manager_lock = threading.Lock()
+
+
+def get_user_manager() -> UserManager:
+    """Process-wide UserManager shared by the web app and every bot"""
+    global _user_manager
+    with _user_manager_lock:
+        if _user_manager is None:
+            _user_manager = UserManager()
+        return _user_manager
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+User Paths - Where each user's state lives on disk
+Users are spread over a two-level fan-out keyed by a hash of the user ID,
+users/ab/cd/<user_id>/, so no directory holds more than a few hundred
+entries even at 100k users. Every module resolves user directories here.
+
+Directories from the old flat layout (users/<user_id>/) are still found;
+run migrate_to_sharded_dirs.py to move them.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+USERS_DIR = Path(os.getenv('USERS_DIR', 'users'))
+
+_FANOUT = re.compile(r'^[0-9a-f]{2}$')
+
+
+def shard(user_id: str) -> str:
+    """Fan-out prefix for a user ID, e.g. '3f/a2'"""
+    digest = hashlib.sha1(str(user_id).encode()).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}"
+
+
+def sharded_user_dir(user_id: str, users_dir=USERS_DIR) -> Path:
+    return Path(users_dir) / shard(user_id) / str(user_id)
+
+
+def legacy_user_dir(user_id: str, users_dir=USERS_DIR) -> Path:
+    return Path(users_dir) / str(user_id)
+
+
+@lru_cache(maxsize=None)
+def _resolve(user_id: str, users_dir: Path) -> Path:
+    sharded = sharded_user_dir(user_id, users_dir)
+    if not sharded.exists():
+        legacy = legacy_user_dir(user_id, users_dir)
+        if legacy.is_dir() and not _is_fanout_dir(legacy):
+            return legacy
+    return sharded
+
+
+def user_dir(user_id: str, users_dir=USERS_DIR) -> Path:
+    """Directory holding a user's state (not created)"""
+    return _resolve(str(user_id), Path(users_dir))
+
+
+def user_file(user_id: str, filename: str, users_dir=USERS_DIR) -> Path:
+    return user_dir(user_id, users_dir) / filename
+
+
+def _is_fanout_dir(path: Path) -> bool:
+    """A first-level shard directory rather than an old flat user directory"""
+    if not _FANOUT.match(path.name):
+        return False
+    return all(child.is_dir() and _FANOUT.match(child.name) for child in path.iterdir())
+
+
+def iter_user_dirs(users_dir=USERS_DIR) -> Iterator[Path]:
+    """Every user directory, sharded or (not yet migrated) flat"""
+    users_dir = Path(users_dir)
+    if not users_dir.exists():
+        return
+    for entry in sorted(users_dir.iterdir()):
+        if not entry.is_dir():
+            continue
+        if _is_fanout_dir(entry):
+            for second in sorted(entry.iterdir()):
+                yield from sorted(path for path in second.iterdir() if path.is_dir())
+        else:
+            yield entry
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Persistence - Coalesced, atomic saves for state files
+Saves mark the state dirty; the file is rewritten once enough changes have
+piled up or enough time has passed, and always on shutdown
+"""
+
+import atexit
+import threading
+import time
+import weakref
+
+from serializer import write_file
+
+FLUSH_INTERVAL = 30  # seconds a change may stay in memory only
+FLUSH_EVERY = 25     # coalesced saves before forcing a write
+
+# Every live store, flushed at interpreter exit
+_stores = weakref.WeakSet()
+
+
+class WriteBehindStore:
+    """
+    Base for stores that keep `self.data` in memory and persist it to
+    `self.filepath`. Call `_init_write_behind()` once both are set.
+    """
+
+    flush_interval = FLUSH_INTERVAL
+    flush_every = FLUSH_EVERY
+
+    def _init_write_behind(self):
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.RLock()
+        _stores.add(self)
+
+    def save(self):
+        """Mark data changed; the write happens when a flush is due"""
+        with self._flush_lock:
+            self._pending += 1
+            due = (self._pending >= self.flush_every or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush_if_due(self):
+        """Flush pending changes older than the flush interval"""
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes now; returns True if the file was written"""
+        with self._flush_lock:
+            if not self._pending:
+                return False
+            self._before_flush()
+            self._write_snapshot()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            self._after_flush()
+            return True
+
+    def _write_snapshot(self):
+        """Write the full state; stores backed by something other than a file override this"""
+        write_file(self.filepath, self.data)
+
+    def _before_flush(self):
+        """Hook: called under the flush lock just before the state is written"""
+
+    def _after_flush(self):
+        """Hook: called under the flush lock once the state is on disk"""
+
+
+def flush_all():
+    """Flush every live store (called at exit)"""
+    for store in list(_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            print(f"❌ Error flushing {getattr(store, 'filepath', store)}: {e}")
+
+
+atexit.register(flush_all)